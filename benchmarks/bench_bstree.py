@@ -0,0 +1,46 @@
+"""Benchmark BSTree vs AVLTree on sorted input
+
+Usage (with dspy installed): python benchmarks/bench_bstree.py [-n N]
+"""
+import argparse
+import random
+import time
+
+from dspy.bstree import AVLTree, BSTree
+
+# plain BSTree degenerates into a linked list on sorted input,
+# building it is O(n^2), so keep it small
+PLAIN_LIMIT = 5000
+
+
+def bench(cls, n: int, lookups: int = 10_000, bulk: bool = False):
+    keys = list(range(n))
+    start = time.perf_counter()
+    tree = cls.bulk_load(keys) if bulk else cls(values=keys)
+    build = time.perf_counter() - start
+
+    queries = [random.randrange(n) for _ in range(lookups)]
+    start = time.perf_counter()
+    for q in queries:
+        tree.find(q)
+    lookup = (time.perf_counter() - start) / lookups
+
+    name = cls.__name__ + (" (bulk)" if bulk else "")
+    print(
+        f"{name:>14}: n={n:>9,} height={tree.height():>6} "
+        f"build={build:8.3f}s lookup={lookup * 1e6:8.2f}us"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", type=int, default=10 ** 6)
+    args = parser.parse_args()
+    bench(BSTree, min(args.n, PLAIN_LIMIT))
+    bench(AVLTree, min(args.n, PLAIN_LIMIT))
+    bench(AVLTree, args.n)
+    bench(BSTree, args.n, bulk=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Bytes per key of BSTree node representations
+
+Usage (with dspy installed): python benchmarks/bench_bstree_memory.py [-n N]
+"""
+import argparse
+import tracemalloc
+
+from dspy.bstree import AVLTree, BSTree
+from dspy.compact_bstree import CompactBSTree
+
+
+class DictNode:
+    """TreeNode as it was before __slots__, for reference
+    (kept in a plain list, which adds 8 bytes/key)
+    """
+
+    def __init__(self, val=0, left=None, right=None):
+        self.val = val
+        self.left = left
+        self.right = right
+        self.size = 1
+
+
+def measure(name: str, build, n: int):
+    # keys are allocated before tracing, only tree structure counts
+    tracemalloc.start()
+    obj = build()  # noqa: F841 keep it alive while measuring
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:>22}: {used / n:8.1f} bytes/key")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", type=int, default=10 ** 6)
+    args = parser.parse_args()
+    keys = list(range(args.n))
+    measure("dict nodes (baseline)", lambda: [DictNode(k) for k in keys], args.n)
+    measure("BSTree", lambda: BSTree.bulk_load(keys), args.n)
+    measure("AVLTree", lambda: AVLTree.bulk_load(keys), args.n)
+    measure("CompactBSTree", lambda: CompactBSTree.bulk_load(keys), args.n)
+
+
+if __name__ == "__main__":
+    main()
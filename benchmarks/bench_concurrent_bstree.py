@@ -0,0 +1,66 @@
+"""Multi-threaded throughput of ConcurrentBSTree
+
+Every worker does `ops` operations, `--writes` share of them are
+inserts (either one by one or batched), the rest are lookups.
+
+Usage (with dspy installed):
+python benchmarks/bench_concurrent_bstree.py [--threads T] [--ops N] [--writes W]
+"""
+import argparse
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from dspy.concurrent_bstree import ConcurrentBSTree
+
+BATCH = 256
+
+
+def worker(tree: ConcurrentBSTree, ops: int, writes: float, batched: bool):
+    rnd = random.Random()
+    pending = []
+    for _ in range(ops):
+        if rnd.random() < writes:
+            val = rnd.randrange(10 ** 9)
+            if not batched:
+                tree.insert(val)
+                continue
+            pending.append(val)
+            if len(pending) == BATCH:
+                tree.insert_many(pending)
+                pending = []
+        else:
+            rnd.randrange(10 ** 9) in tree
+    if pending:
+        tree.insert_many(pending)
+
+
+def bench(threads: int, ops: int, writes: float, batched: bool):
+    tree = ConcurrentBSTree()
+    tree.insert_many(random.sample(range(10 ** 9), k=100_000))
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        jobs = [pool.submit(worker, tree, ops, writes, batched) for _ in range(threads)]
+        for job in jobs:
+            job.result()
+    elapsed = time.perf_counter() - start
+    mode = "batched" if batched else "single"
+    print(
+        f"threads={threads:>2} writes={writes:.0%} {mode:>7}: "
+        f"{threads * ops / elapsed:12,.0f} ops/s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--ops", type=int, default=50_000)
+    parser.add_argument("--writes", type=float, default=0.1)
+    args = parser.parse_args()
+    for threads in (1, args.threads):
+        for batched in (False, True):
+            bench(threads, args.ops, args.writes, batched)
+
+
+if __name__ == "__main__":
+    main()
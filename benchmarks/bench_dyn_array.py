@@ -0,0 +1,159 @@
+"""DynamicArray benchmarks
+
+Usage (with dspy installed): python benchmarks/bench_dyn_array.py [-n N]
+"""
+import argparse
+import time
+import tracemalloc
+from collections import deque
+
+from dspy.dyn_array import CircularArray, DynamicArray, ResizePolicy
+
+
+def memory(n: int):
+    """Bytes per element of boxed vs typed storage for n ints"""
+    for dtype in (None, "i8", "i4"):
+        tracemalloc.start()
+        arr = DynamicArray(dtype=dtype)
+        for i in range(n):
+            # big enough to not be cached small ints
+            arr.append(i + 1000)
+        used, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        name = dtype or "boxed"
+        print(f"memory {name:>6}: {used / n:6.1f} bytes/element (cap {arr._cap:,})")
+
+
+def middle_ops(n: int, ops: int = 200):
+    """Insert/delete in the middle of a big array, list for reference"""
+    for dtype in (None, "i8"):
+        arr = DynamicArray(val=range(n), dtype=dtype)
+        start = time.perf_counter()
+        for _ in range(ops):
+            arr.insert(n // 2, 1)
+        for _ in range(ops):
+            del arr[n // 2]
+        took = (time.perf_counter() - start) / (2 * ops)
+        print(f"middle insert/del {dtype or 'boxed':>6}: {took * 1e6:8.1f}us/op")
+    lst = list(range(n))
+    start = time.perf_counter()
+    for _ in range(ops):
+        lst.insert(n // 2, 1)
+    for _ in range(ops):
+        del lst[n // 2]
+    took = (time.perf_counter() - start) / (2 * ops)
+    print(f"middle insert/del {'list':>6}: {took * 1e6:8.1f}us/op")
+
+
+def policies(n: int):
+    """Resizes and bytes copied by n appends under a few policies"""
+    for growth in (1.25, 1.5, 2.0, 4.0):
+        policy = ResizePolicy(growth_factor=growth, shrink_threshold=0.5 / growth)
+        arr = DynamicArray(dtype="i8", policy=policy)
+        start = time.perf_counter()
+        for i in range(n):
+            arr.append(i)
+        took = time.perf_counter() - start
+        print(
+            f"growth {growth:4}: {arr.resizes:3} resizes, "
+            f"{arr.bytes_copied / n:5.1f} bytes copied/element, "
+            f"{arr.capacity / n:4.2f} cap/size, {took * 1e9 / n:6.1f}ns/append"
+        )
+
+
+def queue_ops(n: int, ops: int = 2000):
+    """prepend/pop_front on an array of n elements, deque for reference"""
+    for cls in (DynamicArray, CircularArray):
+        arr = cls(val=range(n), dtype="i8")
+        start = time.perf_counter()
+        for i in range(ops):
+            arr.prepend(i)
+            arr.pop_front()
+        took = (time.perf_counter() - start) / (2 * ops)
+        print(f"prepend/pop_front {cls.__name__:>13}: {took * 1e6:8.2f}us/op")
+    dq = deque(range(n))
+    start = time.perf_counter()
+    for i in range(ops):
+        dq.appendleft(i)
+        dq.popleft()
+    took = (time.perf_counter() - start) / (2 * ops)
+    print(f"prepend/pop_front {'deque':>13}: {took * 1e6:8.2f}us/op")
+
+
+def bulk_remove(n: int):
+    """Drop every other element: del one by one vs delete_many"""
+    for dtype in (None, "i8"):
+        size = min(n, 20000)  # del one by one is O(n * k)
+        arr = DynamicArray(val=range(size), dtype=dtype)
+        start = time.perf_counter()
+        for idx in reversed(range(0, size, 2)):
+            del arr[idx]
+        one_by_one = time.perf_counter() - start
+        arr = DynamicArray(val=range(size), dtype=dtype)
+        start = time.perf_counter()
+        arr.delete_many(range(0, size, 2))
+        took = time.perf_counter() - start
+        print(
+            f"delete half of {size:,} {dtype or 'boxed':>6}: "
+            f"del {one_by_one * 1e3:8.1f}ms, delete_many {took * 1e3:6.1f}ms"
+        )
+
+
+def lookups(n: int, ops: int = 200):
+    """find over the whole array, plain vs indexed"""
+    for indexed in (False, True):
+        arr = DynamicArray(val=range(n), indexed=indexed)
+        start = time.perf_counter()
+        for i in range(ops):
+            arr.find(n - 1 - i)
+        took = (time.perf_counter() - start) / ops
+        name = "indexed" if indexed else "scan"
+        print(f"find {name:>7}: {took * 1e6:10.2f}us/op")
+
+
+def bulk_build(n: int):
+    """extend vs append loop, iteration, slicing"""
+    for dtype in (None, "i8"):
+        name = dtype or "boxed"
+        start = time.perf_counter()
+        arr = DynamicArray(dtype=dtype)
+        for i in range(n):
+            arr.append(i)
+        appends = time.perf_counter() - start
+        start = time.perf_counter()
+        arr = DynamicArray(dtype=dtype)
+        arr.extend(range(n))
+        extend = time.perf_counter() - start
+        print(
+            f"build {name:>6}: append {appends * 1e9 / n:6.1f}ns/elem, "
+            f"extend {extend * 1e9 / n:6.1f}ns/elem"
+        )
+        start = time.perf_counter()
+        for _ in arr:
+            pass
+        iterate = time.perf_counter() - start
+        start = time.perf_counter()
+        view = arr[::2]
+        sliced = time.perf_counter() - start
+        print(
+            f"iterate {name:>6}: {iterate * 1e9 / n:6.1f}ns/elem, "
+            f"slice view of {len(view):,} in {sliced * 1e6:.1f}us"
+        )
+        del arr, view
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", type=int, default=10 ** 6)
+    args = parser.parse_args()
+    memory(args.n)
+    middle_ops(args.n)
+    policies(args.n)
+    queue_ops(args.n)
+    bulk_remove(args.n)
+    lookups(args.n)
+    bulk_build(args.n)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""MyHashMap (every probing strategy) vs built-in dict: put, get
+(hits and misses), remove, and probe lengths of stored keys
+
+Usage (with dspy installed): python benchmarks/bench_hashmap.py [-n N]
+"""
+import argparse
+import random
+import time
+
+from dspy.hashmap import PROBING, MyHashMap, RobinHoodHashMap
+
+
+class DictMap:
+    """dict behind the MyHashMap interface, for reference"""
+
+    def __init__(self):
+        self._dict = {}
+
+    def put(self, key: int, value: int) -> None:
+        self._dict[key] = value
+
+    def get(self, key: int) -> int:
+        return self._dict.get(key, -1)
+
+    def remove(self, key: int) -> None:
+        self._dict.pop(key, None)
+
+
+def run(factory, keys, misses):
+    """Seconds per phase: put all keys, get them, get misses,
+    remove, and probe stats after puts (None for dict)
+    """
+    hm = factory()
+    times = {}
+    start = time.perf_counter()
+    for key in keys:
+        hm.put(key, key)
+    times["put"] = time.perf_counter() - start
+    stats = hm.probe_stats() if hasattr(hm, "probe_stats") else None
+    start = time.perf_counter()
+    for key in keys:
+        hm.get(key)
+    times["get"] = time.perf_counter() - start
+    start = time.perf_counter()
+    for key in misses:
+        hm.get(key)
+    times["miss"] = time.perf_counter() - start
+    start = time.perf_counter()
+    for key in keys:
+        hm.remove(key)
+    times["remove"] = time.perf_counter() - start
+    return times, stats
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", type=int, default=10 ** 6)
+    args = parser.parse_args()
+    n = args.n
+    # (keys, missing keys): ids not issued yet, random keys of a disjoint range
+    workloads = {
+        "sequential": (list(range(n)), list(range(n, 2 * n))),
+        "random": (
+            random.sample(range(10 ** 12), k=n),
+            random.sample(range(10 ** 12, 2 * 10 ** 12), k=n),
+        ),
+    }
+    # random keys falling into a run of ids walk it with linear
+    # probing, O(n) each, so this one is kept small
+    small = min(n, 10_000)
+    workloads["mixed"] = (
+        list(range(small // 2)) + random.sample(range(10 ** 12), k=small // 2),
+        random.sample(range(10 ** 12, 2 * 10 ** 12), k=small),
+    )
+    factories = {"dict": DictMap}
+    for probing in PROBING:
+        factories[probing] = lambda probing=probing: MyHashMap(probing=probing)
+    factories["robin_hood"] = RobinHoodHashMap
+    for name, (keys, misses) in workloads.items():
+        for label, factory in factories.items():
+            times, stats = run(factory, keys, misses)
+            ops = ", ".join(
+                f"{phase} {took * 1e9 / len(keys):7.1f}ns"
+                for phase, took in times.items()
+            )
+            if stats:
+                ops += f", probes mean {stats['mean']:.2f} max {stats['max']}"
+            print(f"{name:>10} {label:>10}: {ops}")
+
+
+if __name__ == "__main__":
+    main()
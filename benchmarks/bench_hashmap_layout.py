@@ -0,0 +1,49 @@
+"""MyHashMap Item table vs CompactHashMap flat buffers: bytes per
+entry (tracemalloc) and lookup throughput, hits and misses
+
+Usage (with dspy installed): python benchmarks/bench_hashmap_layout.py [-n N]
+"""
+import argparse
+import random
+import time
+import tracemalloc
+
+from dspy.compact_hashmap import CompactHashMap
+from dspy.hashmap import MyHashMap
+
+
+def measure(factory, keys, misses):
+    """Bytes per entry after putting all keys, and ns per get
+    of stored keys and of missing ones
+    """
+    tracemalloc.start()
+    hm = factory()
+    for key in keys:
+        hm.put(key, key + 1)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    times = {}
+    for phase, queries in (("get", keys), ("miss", misses)):
+        start = time.perf_counter()
+        for key in queries:
+            hm.get(key)
+        times[phase] = (time.perf_counter() - start) * 1e9 / len(queries)
+    return size / len(keys), hm._cap, times
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", type=int, default=10 ** 6)
+    args = parser.parse_args()
+    keys = random.sample(range(10 ** 12), k=args.n)
+    misses = random.sample(range(10 ** 12, 2 * 10 ** 12), k=args.n)
+    for label, factory in (("items", MyHashMap), ("compact", CompactHashMap)):
+        per_entry, cap, times = measure(factory, keys, misses)
+        print(
+            f"{label:>8}: {per_entry:6.1f} bytes/entry (capacity {cap}), "
+            f"get {times['get']:6.1f}ns, miss {times['miss']:6.1f}ns"
+        )
+
+
+if __name__ == "__main__":
+    main()
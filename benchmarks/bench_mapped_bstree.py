@@ -0,0 +1,45 @@
+"""Startup and lookup time: memory-mapped dump vs rebuilding a tree
+
+Usage (with dspy installed): python benchmarks/bench_mapped_bstree.py [-n N]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from dspy.bstree import AVLTree
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", type=int, default=10 ** 6)
+    args = parser.parse_args()
+    keys = random.sample(range(10 ** 12), k=args.n)
+    queries = [random.choice(keys) for _ in range(10_000)]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tree.bin")
+        tree, took = timed(lambda: AVLTree.bulk_load(keys))
+        print(f"{'bulk_load':>12}: {took:8.4f}s")
+        tree.dump(path)
+        print(f"{'file size':>12}: {os.path.getsize(path) / args.n:8.1f} bytes/key")
+        for mmap in (False, True):
+            loaded, took = timed(lambda: AVLTree.load(path, mmap=mmap))
+            _, lookups = timed(lambda: [q in loaded for q in queries])
+            name = "load mmap" if mmap else "load build"
+            print(
+                f"{name:>12}: {took:8.4f}s, "
+                f"lookup {lookups / len(queries) * 1e6:6.2f}us"
+            )
+            if mmap:
+                loaded.close()
+
+
+if __name__ == "__main__":
+    main()
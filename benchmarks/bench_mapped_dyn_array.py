@@ -0,0 +1,54 @@
+"""Open time and heap use: memory-mapped array vs rebuilding one
+
+Usage (with dspy installed): python benchmarks/bench_mapped_dyn_array.py [-n N]
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from dspy.dyn_array import DynamicArray
+from dspy.mapped_dyn_array import MappedArray
+
+
+def timed(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    took = time.perf_counter() - start
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, took, used
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", type=int, default=10 ** 6)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "col.bin")
+        with MappedArray(path, dtype="f8") as arr:
+            start = time.perf_counter()
+            for i in range(args.n):
+                arr.append(i / 3)
+            took = time.perf_counter() - start
+            print(f"{'append':>12}: {took * 1e9 / args.n:8.1f}ns/op")
+        print(f"{'file size':>12}: {os.path.getsize(path) / args.n:8.1f} bytes/elem")
+        with MappedArray(path) as arr:
+            values = arr.buffer().tolist()
+        loaded, took, used = timed(lambda: DynamicArray(val=values, dtype="f8"))
+        print(f"{'rebuild':>12}: {took:8.4f}s, heap {used / 2**20:8.2f}MiB")
+        loaded, took, used = timed(lambda: MappedArray(path))
+        print(f"{'open mmap':>12}: {took:8.4f}s, heap {used / 2**20:8.2f}MiB")
+        reads = range(0, len(loaded), 7)
+        start = time.perf_counter()
+        for i in reads:
+            loaded[i]
+        took = time.perf_counter() - start
+        print(f"{'mmap reads':>12}: {took * 1e9 / len(reads):8.1f}ns/op")
+        loaded.close()
+
+
+if __name__ == "__main__":
+    main()
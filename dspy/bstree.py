@@ -1,32 +1,262 @@
 """Binary Search Tree Implementation"""
 
-import queue
-from typing import Any, List, Optional
+from collections import deque
+from typing import Any, Callable, Iterable, Iterator, List, Optional
 
 
 # Definition for a binary tree node.
+# `size` is a number of nodes in the subtree rooted at this node,
+# BSTree keeps it up to date, if you link nodes manually, you own it
 class TreeNode:
+    # no per-instance __dict__, big trees are mostly nodes
+    __slots__ = ("val", "left", "right", "size")
+
     def __init__(self, val=0, left=None, right=None):
         self.val = val
         self.left = left
         self.right = right
+        self.size = 1 + _subtree_size(left) + _subtree_size(right)
 
 
 class BSTree:
-    def __init__(self, values: Optional[List[Any]] = None) -> None:
+    def __init__(
+        self,
+        values: Optional[List[Any]] = None,
+        dtype: Optional[type] = None,
+        trusted: bool = False,
+    ) -> None:
+        """
+        Args:
+            values (Optional[List[Any]], optional): values to insert.
+            Defaults to None.
+            dtype (Optional[type], optional): values type, if not given
+            it is taken from the first inserted value. Defaults to None.
+            trusted (bool, optional): caller guarantees values are of
+            `dtype`, per-call type checks are skipped. Defaults to False.
+
+        Raises:
+            AttributeError: if `dtype` values are not comparable
+        """
+        if dtype is not None and dtype.__lt__ is object.__lt__:
+            raise AttributeError(f"{dtype} is not comparable")
         self.root = None
-        self.__dtype = None
+        self.__dtype = dtype
+        self._trusted = trusted
         self._size = 0
+        # number of values refused (or not found) because of type mismatch
+        self.type_mismatches = 0
         if values:
             self._from_values(values)
 
+    @classmethod
+    def bulk_load(cls, values: Iterable[Any]) -> "BSTree":
+        """Build a perfectly balanced tree from `values` at once.
+        Values are sorted (skipped if already sorted) and deduplicated,
+        then the tree is built in O(n) from the middle out.
+        Values of a type different from the first one are dropped,
+        the same way `insert` refuses them.
+
+        Args:
+            values (Iterable[Any]): values to load
+
+        Returns:
+            BSTree: new balanced tree
+        """
+        tree = cls()
+        values = list(values)
+        if not values:
+            return tree
+        tree._dtype = values[0]
+        dtype = tree._dtype
+        values = [v for v in values if isinstance(v, dtype)]
+        if any(not a < b for a, b in zip(values, values[1:])):
+            values = sorted(values)
+            values = [v for i, v in enumerate(values) if i == 0 or values[i - 1] != v]
+        tree._load_sorted(values)
+        return tree
+
+    def _load_sorted(self, values: List[Any]):
+        """Replace tree content with a perfectly balanced
+        tree built from sorted unique `values` in O(n)
+
+        Args:
+            values (List[Any]): sorted unique values
+        """
+        self.delete()
+        if values:
+            self._dtype = values[0]
+        self.root = self._build_sorted(values)
+        self._size = len(values)
+
+    def _build_sorted(self, values: List[Any]) -> Optional[TreeNode]:
+        """Root of a perfectly balanced tree of sorted unique
+        `values`, the tree itself is left untouched
+        """
+
+        def _build(lo: int, hi: int) -> Optional[TreeNode]:
+            if lo >= hi:
+                return None
+            mid = (lo + hi) // 2
+            return self._join(_build(lo, mid), values[mid], _build(mid + 1, hi))
+
+        return _build(0, len(values))
+
+    def union(self, other: "BSTree") -> "BSTree":
+        """New balanced tree with values from both trees.
+        Sorted value streams of both trees are merged in
+        O(n + m), then the result is built in O(n + m).
+        Nodes are rebuilt with their payload (TreeMap values),
+        for values in both trees the node of `other` wins
+
+        Args:
+            other (BSTree): tree with the same values type
+
+        Returns:
+            BSTree: new tree of the same class as self
+        """
+        return self._merged(other, left=True, both=True, right=True)
+
+    def intersection(self, other: "BSTree") -> "BSTree":
+        """New balanced tree with values in both trees, O(n + m)"""
+        return self._merged(other, left=False, both=True, right=False)
+
+    def difference(self, other: "BSTree") -> "BSTree":
+        """New balanced tree with values in self but not in other, O(n + m)"""
+        return self._merged(other, left=True, both=False, right=False)
+
+    def symmetric_difference(self, other: "BSTree") -> "BSTree":
+        """New balanced tree with values in exactly one of trees, O(n + m)"""
+        return self._merged(other, left=True, both=False, right=True)
+
+    def update(self, other: "BSTree"):
+        """In place union. If `other` is small compared to self,
+        its values are inserted one by one, otherwise self is
+        rebuilt from merged streams. `other` is never modified
+        """
+        if self._one_by_one(other):
+            for item in other._items():
+                self._insert_item(item)
+        else:
+            self._load_sorted(self._merge(other, left=True, both=True, right=True))
+
+    def intersection_update(self, other: "BSTree"):
+        """In place intersection, O(n + m)"""
+        self._load_sorted(self._merge(other, left=False, both=True, right=False))
+
+    def difference_update(self, other: "BSTree"):
+        """In place difference, small `other` values are
+        deleted one by one, otherwise self is rebuilt
+        """
+        if self._one_by_one(other):
+            for val in other.irange():
+                self.del_value(val)
+        else:
+            self._load_sorted(self._merge(other, left=True, both=False, right=False))
+
+    def symmetric_difference_update(self, other: "BSTree"):
+        """In place symmetric difference, small `other` is
+        applied value by value, otherwise self is rebuilt
+        """
+        if self._one_by_one(other):
+            for item in other._items():
+                if not self.del_value(other._item_key(item)):
+                    self._insert_item(item)
+        else:
+            self._load_sorted(self._merge(other, left=True, both=False, right=True))
+
+    def _merged(self, other: "BSTree", left: bool, both: bool, right: bool) -> "BSTree":
+        tree = type(self)()
+        tree._load_sorted(self._merge(other, left, both, right))
+        return tree
+
+    def _merge(self, other: "BSTree", left: bool, both: bool, right: bool) -> List[Any]:
+        self._check_items(other)
+        key = None if self._item_key is BSTree._item_key else self._item_key
+        return _merge_sorted(self._items(), other._items(), left, both, right, key)
+
+    def _items(self) -> Iterator[Any]:
+        """Sorted stream of what set algebra carries per
+        node: values here, subclasses with node payload
+        yield it too (see `_item_key`)
+        """
+        return self.irange()
+
+    @staticmethod
+    def _item_key(item: Any) -> Any:
+        # tree value of an `_items` element
+        return item
+
+    def _insert_item(self, item: Any):
+        self.insert(item)
+
+    def _check_items(self, other: "BSTree"):
+        """Raise TypeError unless `other` is a tree streaming
+        the same kind of items (values, or entries of maps),
+        AttributeError if both trees hold values of different types
+        """
+        if not isinstance(other, BSTree) or other._item_key is not self._item_key:
+            raise TypeError(
+                f"Can't combine {type(self).__name__} with {type(other).__name__}"
+            )
+        if self._dtype is not None and other._dtype is not None:
+            if self._dtype is not other._dtype:
+                raise AttributeError(f"Type mismatch: {other._dtype} != {self._dtype}")
+
+    def _one_by_one(self, other: "BSTree") -> bool:
+        # m single-value operations cost ~ m * log(n),
+        # rebuild costs n + m
+        self._check_items(other)
+        n, m = self._size, other._size
+        return m * n.bit_length() < n + m
+
+    def freeze(self):
+        """Export tree values into a read-only, array-based
+        StaticIndex for batch lookups, O(n)
+
+        Returns:
+            StaticIndex: frozen copy of the tree values
+        """
+        from dspy.static_index import StaticIndex  # it builds on top of trees
+
+        return StaticIndex.from_tree(self)
+
+    def dump(self, path: str):
+        """Write tree values (int, float or str) into a compact
+        sorted binary file, see `dspy.mapped_bstree` for layout
+
+        Args:
+            path (str): file to write
+
+        Raises:
+            ValueError: if values type is not supported
+        """
+        from dspy.mapped_bstree import dump
+
+        dump(list(self.irange()), self._dtype, path)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True):
+        """Open a tree written by `dump`
+
+        Args:
+            path (str): file to read
+            mmap (bool, optional): if True, return read-only
+            MappedBSTree searching the memory-mapped file directly,
+            O(1) to open. Otherwise, read values and build a
+            balanced tree of this class in O(n). Defaults to True.
+
+        Returns:
+            Union[MappedBSTree, BSTree]: loaded tree
+        """
+        from dspy.mapped_bstree import MappedBSTree, read_values
+
+        if mmap:
+            return MappedBSTree(path)
+        return cls.bulk_load(read_values(path))
+
     def __contains__(self, val: Any) -> bool:
         return not self.find(val) is None
 
-    # NOTE! Remember, if recursive function called with None object
-    # it brakes referencing to the not-None object and you modify nothing
-    # if _insert takes node=None, and then try to assign some value to it,
-    # this evaluates into None = TreeNode(val) and breaks the recursive chain!
     def insert(self, val: Any) -> bool:
         """Insert a Node with value `val` in the tree
         according to BS Tree invariant. Value type mis-
@@ -40,88 +270,138 @@ class BSTree:
             False otherwise [incorrect value type,
             duplicate]
         """
-        self._dtype = val
-        try:
-            self._check_dtype_mismatch(val)
-        except AttributeError:
+        if self.root is None:
+            self._dtype = val
+        if not (self._trusted or self._type_ok(val)):
             return False
 
         # duplicates are not allowed
-        if val in self:
+        if self._search(val) is not None:
             return False
 
-        def _insert(node: Optional[TreeNode], val: Any) -> TreeNode:
-            if node is None:
-                return TreeNode(val=val)
-            if val < node.val:
-                node.left = _insert(node.left, val)
-            else:
-                node.right = _insert(node.right, val)
-            return node
-
-        self.root = _insert(self.root, val)
+        self._insert(val)
         self._size += 1
         return True
 
     def del_value(self, val: Any) -> bool:
-        try:
-            self._check_dtype_mismatch(val)
-        except AttributeError:
+        if not (self._trusted or self._type_ok(val)):
             return False
 
-        if self.find(val) is None:
+        if self._search(val) is None:
             return False
 
-        def _delete(node: Optional[TreeNode], val: Any) -> Optional[TreeNode]:
-            if node is None:
-                return node
-            if val < node.val:
-                node.left = _delete(node.left, val)
-            elif val > node.val:
-                node.right = _delete(node.right, val)
-            else:  # delete this node
-                # Cases one or both children is None
-                # case left is None
-                if node.left is None:
-                    tmp = node.right
-                    node = None
-                    return tmp
-                elif node.right is None:
-                    tmp = node.left
-                    node = None
-                    return tmp
-                # Two children case
-                else:
-                    # Find successor
-                    suc = _first(node.right)
-                    # Swap values
-                    node.val, suc.val = suc.val, node.val
-                    # Delete swapped node down in the right subtree
-                    node.right = _delete(node.right, val)
-            return node
-
-        self.root = _delete(self.root, val)
+        self._delete(val)
         self._size -= 1
         return True
 
+    def _insert(self, val: Any) -> TreeNode:
+        """Attach a new node with `val` (not in the tree yet)
+        walking down from the root, no recursion involved
+
+        Args:
+            val (Any): value to insert
+
+        Returns:
+            TreeNode: attached node
+        """
+        node = self._new_node(val)
+        if self.root is None:
+            self.root = node
+            return node
+        path = []
+        current = self.root
+        while current is not None:
+            path.append(current)
+            current.size += 1
+            current = current.left if val < current.val else current.right
+        parent = path[-1]
+        if val < parent.val:
+            parent.left = node
+        else:
+            parent.right = node
+        self._rebalance(path)
+        return node
+
+    def _delete(self, val: Any):
+        """Unlink node with `val` (must be in the tree),
+        no recursion involved
+
+        Args:
+            val (Any): value to delete
+        """
+        path = []
+        node = self.root
+        while node.val != val:
+            path.append(node)
+            node = node.left if val < node.val else node.right
+        # Two children case: take successor value and
+        # unlink successor node instead, it has no left child
+        if node.left is not None and node.right is not None:
+            path.append(node)
+            suc = node.right
+            while suc.left is not None:
+                path.append(suc)
+                suc = suc.left
+            self._move_val(node, suc)
+            node = suc
+        # Now one or both children is None
+        child = node.left if node.left is not None else node.right
+        if not path:
+            self.root = child
+        elif path[-1].left is node:
+            path[-1].left = child
+        else:
+            path[-1].right = child
+        for ancestor in path:
+            ancestor.size -= 1
+        self._rebalance(path)
+
+    def _new_node(self, val: Any) -> TreeNode:
+        return TreeNode(val=val)
+
+    def _move_val(self, dst: TreeNode, src: TreeNode):
+        # node payload to keep when `src` node is unlinked
+        dst.val = src.val
+
+    def _join(
+        self, left: Optional[TreeNode], val: Any, right: Optional[TreeNode]
+    ) -> TreeNode:
+        """Make a new node with `val` on top of two
+        subtrees (used by bulk building)
+        """
+        node = self._new_node(val)
+        node.left, node.right = left, right
+        _update_size(node)
+        return node
+
+    def _rebalance(self, path: List[TreeNode]):
+        """Hook called after insert/delete with a root-to-parent
+        path of the changed node. Plain BS Tree does no rebalancing,
+        subclasses may
+
+        Args:
+            path (List[TreeNode]): nodes from the root down to the
+            parent of the attached/unlinked node
+        """
+        pass
+
     def delete(self):
         self.root = None
         self._size = 0
 
     def is_bstree(self) -> bool:
-        def _is_bstree(root: Optional[TreeNode]) -> bool:
-            if root is None:
-                return True
-            left = True
-            if root.left:
-                left = root.left.val < root.val
-            right = True
-            if root.right:
-                right = root.right.val > root.val
-            current = left and right
-            return _is_bstree(root.left) and current and _is_bstree(root.right)
-
-        return _is_bstree(self.root)
+        stack = [self.root] if self.root else []
+        while stack:
+            node = stack.pop()
+            if node.left:
+                if not node.left.val < node.val:
+                    return False
+                stack.append(node.left)
+            if node.right:
+                if not node.right.val > node.val:
+                    return False
+                stack.append(node.right)
+        return True
 
     def _from_values(self, values: List[Any]):
         for val in values:
@@ -133,17 +413,57 @@ class BSTree:
         Returns:
             List[Any]: list of values [in order]
         """
-        values = []
+        return list(iter_inorder(self.root))
 
-        def inner(node: Optional[TreeNode]):
-            if not node:
-                return
-            inner(node.left)
-            values.append(node.val)
-            inner(node.right)
+    def irange(
+        self, lo: Any = None, hi: Any = None, reverse: bool = False
+    ) -> Iterator[Any]:
+        """Lazily yield values `v` such that lo <= v <= hi
+        in order (or in reverse order). Only subtrees which
+        may hold values in range are visited, an explicit stack
+        keeps memory at O(height), k values cost O(height + k)
 
-        inner(self.root)
-        return values
+        Args:
+            lo (Any, optional): lower bound (inclusive), None
+            for unbounded. Defaults to None.
+            hi (Any, optional): upper bound (inclusive), None
+            for unbounded. Defaults to None.
+            reverse (bool, optional): yield from `hi` down to `lo`.
+            Defaults to False.
+
+        Yields:
+            Iterator[Any]: values in range
+        """
+        # `near` child holds smaller values in iteration order
+        near, far = ("right", "left") if reverse else ("left", "right")
+
+        def before_start(val) -> bool:
+            if reverse:
+                return hi is not None and hi < val
+            return lo is not None and val < lo
+
+        def after_end(val) -> bool:
+            if reverse:
+                return lo is not None and val < lo
+            return hi is not None and hi < val
+
+        stack = []
+        node = self.root
+        while node is not None:
+            if before_start(node.val):
+                node = getattr(node, far)
+            else:
+                stack.append(node)
+                node = getattr(node, near)
+        while stack:
+            node = stack.pop()
+            if after_end(node.val):
+                return
+            yield node.val
+            node = getattr(node, far)
+            while node is not None:
+                stack.append(node)
+                node = getattr(node, near)
 
     def find(self, val: Any) -> Optional[TreeNode]:
         """Find a Node containing a value `val`
@@ -155,27 +475,20 @@ class BSTree:
             Optional[TreeNode]: Node if `val` found,
             None otherwise
         """
-        if not self.root:
+        if self.root is None:
             return None
-        try:
-            self._check_dtype_mismatch(val)
-        except AttributeError:
-            print(
-                f"Trying to find incompatible value of type {type(val)}, in the Tree with type: {self._dtype}"
-            )
+        if not (self._trusted or self._type_ok(val)):
             return None
+        return self._search(val)
 
-        def _find(node: Optional[TreeNode], val: Any):
-            if not node:
-                return None
+    def _search(self, val: Any) -> Optional[TreeNode]:
+        # plain walk, no type checks
+        node = self.root
+        while node is not None:
             if node.val == val:
                 return node
-            elif val < node.val:
-                return _find(node.left, val)
-            else:
-                return _find(node.right, val)
-
-        return _find(self.root, val)
+            node = node.left if val < node.val else node.right
+        return None
 
     def height(self) -> int:
         """Returns tree height
@@ -185,17 +498,84 @@ class BSTree:
             downward pass from the root (number
             of edges in the longest subtree from root)
         """
-
-        def _height(node: Optional[TreeNode]) -> int:
-            if node is None or _is_leaf(node):
-                return 0
-            return max(_height(node.left), _height(node.right)) + 1
-
-        return _height(self.root)
+        # level by level, height is number of levels - 1
+        height = -1
+        for _ in iter_levels(self.root, nodes=True):
+            height += 1
+        return max(height, 0)
 
     def get_node_count(self) -> int:
         return self._size
 
+    def rank(self, val: Any) -> int:
+        """Number of values in the tree strictly less
+        than `val`, `val` itself doesn't have to be in the
+        tree. O(height) using subtree sizes
+
+        Args:
+            val (Any): value to rank
+
+        Returns:
+            int: rank of `val`
+        """
+        return self._count_less(val, inclusive=False)
+
+    def select(self, k: int) -> Any:
+        """Returns k-th smallest value (0-based), so
+        `select(rank(v)) == v` for any `v` in the tree.
+        Negative `k` counts from the end. O(height)
+
+        Args:
+            k (int): order statistic to find
+
+        Raises:
+            IndexError: if `k` is out of tree range
+
+        Returns:
+            Any: k-th smallest value
+        """
+        if k < 0:
+            k += self._size
+        if k < 0 or k >= self._size:
+            raise IndexError("tree index out of range")
+        node = self.root
+        while True:
+            left = _subtree_size(node.left)
+            if k < left:
+                node = node.left
+            elif k > left:
+                k -= left + 1
+                node = node.right
+            else:
+                return node.val
+
+    def count_range(self, lo: Any, hi: Any) -> int:
+        """Number of values `v` such that lo <= v <= hi.
+        O(height)
+
+        Args:
+            lo (Any): lower bound (inclusive)
+            hi (Any): upper bound (inclusive)
+
+        Returns:
+            int: count of values in range
+        """
+        if hi < lo:
+            return 0
+        below_hi = self._count_less(hi, inclusive=True)
+        return below_hi - self._count_less(lo, inclusive=False)
+
+    def _count_less(self, val: Any, inclusive: bool) -> int:
+        count = 0
+        node = self.root
+        while node is not None:
+            if node.val < val or (inclusive and node.val == val):
+                count += _subtree_size(node.left) + 1
+                node = node.right
+            else:
+                node = node.left
+        return count
+
     def get_successor(self, val: Any) -> Any:
         """Returns a next value after `val`
         in "in-order" order.
@@ -243,8 +623,11 @@ class BSTree:
 
     @_dtype.setter
     def _dtype(self, val):
-        # if trying to reassign, pass
+        # if trying to reassign, pass, but the first value
+        # of a declared type must be comparable as well
         if self.__dtype is not None:
+            if self.root is None and isinstance(val, self.__dtype):
+                self._check_dtype(val)
             return
         # check if value is of comparable dtype
         self._check_dtype(val)
@@ -257,6 +640,15 @@ class BSTree:
         elif val.__lt__(val) == NotImplemented:
             raise AttributeError(f"{val} is not comparable")
 
+    def _type_ok(self, val: Any) -> bool:
+        # hot path variant of _check_dtype_mismatch,
+        # no exceptions, refused values are counted
+        dtype = self.__dtype
+        if dtype is None or isinstance(val, dtype):
+            return True
+        self.type_mismatches += 1
+        return False
+
     def _check_dtype_mismatch(self, val: Any):
         # allow only values of same type in the tree
         if self._dtype is not None:
@@ -264,31 +656,219 @@ class BSTree:
                 raise AttributeError(f"Type mismatch: {type(val)} != {self._dtype}")
 
 
+class AVLNode(TreeNode):
+    """Tree node which also keeps the height of its subtree"""
+
+    __slots__ = ("height",)
+
+    def __init__(self, val=0, left=None, right=None):
+        super().__init__(val=val, left=left, right=right)
+        self.height = 0
+
+
+class AVLTree(BSTree):
+    """Self-balancing (AVL) BS Tree. Same API as BSTree,
+    but after every insert and delete subtree heights of
+    siblings differ by at most one, so tree height stays
+    O(log n) even if values arrive sorted.
+    """
+
+    def height(self) -> int:
+        """Returns tree height in O(1), every node
+        keeps the height of its own subtree
+
+        Returns:
+            int: height represents a longest
+            downward pass from the root (number
+            of edges in the longest subtree from root)
+        """
+        return max(_node_height(self.root), 0)
+
+    def _new_node(self, val: Any) -> AVLNode:
+        return AVLNode(val=val)
+
+    def _join(
+        self, left: Optional[AVLNode], val: Any, right: Optional[AVLNode]
+    ) -> AVLNode:
+        node = super()._join(left, val, right)
+        _update_height(node)
+        return node
+
+    def _rebalance(self, path: List[AVLNode]):
+        """Walk the changed path bottom-up and restore AVL
+        invariant, stop as soon as a subtree height is unchanged
+        (nothing above it can be affected)
+
+        Args:
+            path (List[AVLNode]): nodes from the root down to the
+            parent of the attached/unlinked node
+        """
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            old_height = node.height
+            new = self._balance(node)
+            if new is not node:
+                if i == 0:
+                    self.root = new
+                elif path[i - 1].left is node:
+                    path[i - 1].left = new
+                else:
+                    path[i - 1].right = new
+            if new.height == old_height:
+                break
+
+    def _balance(self, node: AVLNode) -> AVLNode:
+        """Restore AVL invariant at `node` with at most
+        two rotations, assuming both subtrees are balanced
+
+        Args:
+            node (AVLNode): root of subtree to balance
+
+        Returns:
+            AVLNode: new root of the subtree
+        """
+        _update_height(node)
+        balance = _node_height(node.left) - _node_height(node.right)
+        if balance > 1:  # left heavy
+            if _node_height(node.left.left) < _node_height(node.left.right):
+                node.left = _rotate_left(node.left)
+            return _rotate_right(node)
+        if balance < -1:  # right heavy
+            if _node_height(node.right.right) < _node_height(node.right.left):
+                node.right = _rotate_right(node.right)
+            return _rotate_left(node)
+        return node
+
+
 def level_traverse(root: Optional[TreeNode]) -> List[Any]:
-    values = []
-    fifo = queue.Queue()
-    if root:
-        fifo.put(root)
-    while not fifo.empty():
-        node = fifo.get()
-        values.append(node.val)
-        if lft := node.left:
-            fifo.put(lft)
-        if rht := node.right:
-            fifo.put(rht)
-    return values
+    return list(iter_level_order(root))
+
+
+# Lazy traversals: explicit stacks / deque, no recursion and no
+# locking. If `nodes` is True, TreeNode objects are yielded instead
+# of values. Depth-first ones keep O(height) nodes in memory,
+# level order ones keep O(width).
+
+
+def iter_preorder(root: Optional[TreeNode], nodes: bool = False) -> Iterator[Any]:
+    stack = [root] if root else []
+    while stack:
+        node = stack.pop()
+        yield node if nodes else node.val
+        if node.right:
+            stack.append(node.right)
+        if node.left:
+            stack.append(node.left)
+
+
+def iter_inorder(root: Optional[TreeNode], nodes: bool = False) -> Iterator[Any]:
+    stack = []
+    node = root
+    while stack or node:
+        while node:
+            stack.append(node)
+            node = node.left
+        node = stack.pop()
+        yield node if nodes else node.val
+        node = node.right
+
+
+def iter_postorder(root: Optional[TreeNode], nodes: bool = False) -> Iterator[Any]:
+    stack = []
+    last = None  # last yielded node
+    node = root
+    while stack or node:
+        while node:
+            stack.append(node)
+            node = node.left
+        top = stack[-1]
+        # go right only if right subtree is not done yet
+        if top.right and top.right is not last:
+            node = top.right
+        else:
+            last = stack.pop()
+            yield last if nodes else last.val
+
+
+def iter_level_order(root: Optional[TreeNode], nodes: bool = False) -> Iterator[Any]:
+    fifo = deque([root] if root else [])
+    while fifo:
+        node = fifo.popleft()
+        yield node if nodes else node.val
+        if node.left:
+            fifo.append(node.left)
+        if node.right:
+            fifo.append(node.right)
+
+
+def iter_levels(root: Optional[TreeNode], nodes: bool = False) -> Iterator[List[Any]]:
+    """Level order traversal, yields a list per tree level"""
+    level = [root] if root else []
+    while level:
+        yield level if nodes else [node.val for node in level]
+        level = [ch for node in level for ch in (node.left, node.right) if ch]
 
 
 # assume it is not binary search tree
 def find_by_value(root: TreeNode, val: int) -> Optional[TreeNode]:
-    if val == root.val:
-        return root
-    elif root.left is not None:
-        return find_by_value(root.left, val)
-    elif root.right is not None:
-        return find_by_value(root.right, val)
-    else:
-        return None
+    node = root
+    while node is not None:
+        if val == node.val:
+            return node
+        # left child if there is one, else the right one
+        node = node.left if node.left is not None else node.right
+    return None
+
+
+_END = object()  # exhausted iterator marker
+
+
+def _merge_sorted(
+    left: Iterator[Any],
+    right: Iterator[Any],
+    keep_left: bool,
+    keep_both: bool,
+    keep_right: bool,
+    key: Optional[Callable[[Any], Any]] = None,
+) -> List[Any]:
+    """Merge two sorted streams of unique values in one pass.
+    For values in both streams the one of the second is kept
+
+    Args:
+        left (Iterator[Any]): first sorted stream
+        right (Iterator[Any]): second sorted stream
+        keep_left (bool): keep values only in the first stream
+        keep_both (bool): keep values in both streams (once)
+        keep_right (bool): keep values only in the second stream
+        key (Optional[Callable[[Any], Any]], optional): sort key of
+        stream elements, elements themselves if None. Defaults to None.
+
+    Returns:
+        List[Any]: sorted unique merged values
+    """
+    merged = []
+    a, b = next(left, _END), next(right, _END)
+    while a is not _END and b is not _END:
+        ka, kb = (a, b) if key is None else (key(a), key(b))
+        if ka < kb:
+            if keep_left:
+                merged.append(a)
+            a = next(left, _END)
+        elif kb < ka:
+            if keep_right:
+                merged.append(b)
+            b = next(right, _END)
+        else:
+            if keep_both:
+                merged.append(b)
+            a, b = next(left, _END), next(right, _END)
+    if keep_left and a is not _END:
+        merged.append(a)
+        merged.extend(left)
+    if keep_right and b is not _END:
+        merged.append(b)
+        merged.extend(right)
+    return merged
 
 
 def _is_leaf(node: TreeNode) -> bool:
@@ -305,9 +885,9 @@ def _first(root: TreeNode) -> TreeNode:
     Returns:
         TreeNode: first node in subtree
     """
-    if root.left is None:
-        return root
-    return _first(root.left)
+    while root.left is not None:
+        root = root.left
+    return root
 
 
 def _last(root: TreeNode) -> TreeNode:
@@ -320,6 +900,62 @@ def _last(root: TreeNode) -> TreeNode:
     Returns:
         TreeNode: last node in subtree
     """
-    if root.right is None:
-        return root
-    return _last(root.right)
+    while root.right is not None:
+        root = root.right
+    return root
+
+
+def _subtree_size(node: Optional[TreeNode]) -> int:
+    return 0 if node is None else node.size
+
+
+def _update_size(node: TreeNode):
+    node.size = _subtree_size(node.left) + _subtree_size(node.right) + 1
+
+
+def _node_height(node: Optional[AVLNode]) -> int:
+    return -1 if node is None else node.height
+
+
+def _update_height(node: AVLNode):
+    node.height = max(_node_height(node.left), _node_height(node.right)) + 1
+
+
+def _rotate_left(node: AVLNode) -> AVLNode:
+    """Rotate `node` subtree to the left, right child
+    becomes a new subtree root
+
+    Args:
+        node (AVLNode): root of subtree
+
+    Returns:
+        AVLNode: new root of subtree
+    """
+    pivot = node.right
+    node.right = pivot.left
+    pivot.left = node
+    _update_height(node)
+    _update_height(pivot)
+    pivot.size = node.size
+    _update_size(node)
+    return pivot
+
+
+def _rotate_right(node: AVLNode) -> AVLNode:
+    """Rotate `node` subtree to the right, left child
+    becomes a new subtree root
+
+    Args:
+        node (AVLNode): root of subtree
+
+    Returns:
+        AVLNode: new root of subtree
+    """
+    pivot = node.left
+    node.left = pivot.right
+    pivot.right = node
+    _update_height(node)
+    _update_height(pivot)
+    pivot.size = node.size
+    _update_size(node)
+    return pivot
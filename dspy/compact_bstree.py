@@ -0,0 +1,264 @@
+"""Binary Search Tree with array-backed node pool"""
+
+from array import array
+from typing import Any, Iterator, List, Optional
+
+from dspy.bstree import BSTree
+
+_NIL = -1  # "no child" index
+
+
+class CompactBSTree(BSTree):
+    """BS Tree which keeps nodes in a pool of parallel arrays
+    instead of TreeNode objects: values in a list, left/right
+    child indices and subtree sizes in typed arrays. Freed
+    slots are chained into a free list (through `_left`) and
+    reused by later inserts.
+
+    Public API is the one of BSTree, except node handles:
+    `root` and `find` give a slot index (or None) instead of
+    a TreeNode, `value(idx)` reads a slot value.
+    """
+
+    def __init__(
+        self,
+        values: Optional[List[Any]] = None,
+        dtype: Optional[type] = None,
+        trusted: bool = False,
+    ) -> None:
+        self._vals: List[Any] = []
+        self._left = array("q")
+        self._right = array("q")
+        self._sizes = array("q")
+        self._free = _NIL  # head of free slots list
+        super().__init__(values, dtype=dtype, trusted=trusted)
+
+    def value(self, idx: int) -> Any:
+        return self._vals[idx]
+
+    def delete(self):
+        super().delete()
+        self._vals = []
+        self._left = array("q")
+        self._right = array("q")
+        self._sizes = array("q")
+        self._free = _NIL
+
+    def _alloc(self, val: Any) -> int:
+        """Take a slot from the free list or grow the pool
+
+        Args:
+            val (Any): value to store
+
+        Returns:
+            int: slot index
+        """
+        idx = self._free
+        if idx == _NIL:
+            self._vals.append(val)
+            self._left.append(_NIL)
+            self._right.append(_NIL)
+            self._sizes.append(1)
+            return len(self._vals) - 1
+        self._free = self._left[idx]
+        self._vals[idx] = val
+        self._left[idx] = self._right[idx] = _NIL
+        self._sizes[idx] = 1
+        return idx
+
+    def _release(self, idx: int):
+        self._vals[idx] = None  # drop reference to the value
+        self._left[idx] = self._free
+        self._free = idx
+
+    def _insert(self, val: Any) -> int:
+        idx = self._alloc(val)
+        if self.root is None:
+            self.root = idx
+            return idx
+        vals, left, right, sizes = self._vals, self._left, self._right, self._sizes
+        current = self.root
+        while True:
+            sizes[current] += 1
+            if val < vals[current]:
+                if left[current] == _NIL:
+                    left[current] = idx
+                    return idx
+                current = left[current]
+            else:
+                if right[current] == _NIL:
+                    right[current] = idx
+                    return idx
+                current = right[current]
+
+    def _delete(self, val: Any):
+        vals, left, right, sizes = self._vals, self._left, self._right, self._sizes
+        path = []
+        node = self.root
+        while vals[node] != val:
+            path.append(node)
+            node = left[node] if val < vals[node] else right[node]
+        # Two children case: take successor value and
+        # unlink successor slot instead, it has no left child
+        if left[node] != _NIL and right[node] != _NIL:
+            path.append(node)
+            suc = right[node]
+            while left[suc] != _NIL:
+                path.append(suc)
+                suc = left[suc]
+            vals[node] = vals[suc]
+            node = suc
+        child = left[node] if left[node] != _NIL else right[node]
+        if not path:
+            self.root = None if child == _NIL else child
+        elif left[path[-1]] == node:
+            left[path[-1]] = child
+        else:
+            right[path[-1]] = child
+        for ancestor in path:
+            sizes[ancestor] -= 1
+        self._release(node)
+
+    def _join(self, left: Optional[int], val: Any, right: Optional[int]) -> int:
+        idx = self._alloc(val)
+        self._left[idx] = _NIL if left is None else left
+        self._right[idx] = _NIL if right is None else right
+        self._sizes[idx] = 1 + self._size_of(left) + self._size_of(right)
+        return idx
+
+    def _size_of(self, idx: Optional[int]) -> int:
+        return 0 if idx is None or idx == _NIL else self._sizes[idx]
+
+    def _search(self, val: Any) -> Optional[int]:
+        if self.root is None:
+            return None
+        vals, left, right = self._vals, self._left, self._right
+        node = self.root
+        while node != _NIL:
+            if vals[node] == val:
+                return node
+            node = left[node] if val < vals[node] else right[node]
+        return None
+
+    def is_bstree(self) -> bool:
+        vals, left, right = self._vals, self._left, self._right
+        stack = [] if self.root is None else [self.root]
+        while stack:
+            node = stack.pop()
+            if left[node] != _NIL:
+                if not vals[left[node]] < vals[node]:
+                    return False
+                stack.append(left[node])
+            if right[node] != _NIL:
+                if not vals[right[node]] > vals[node]:
+                    return False
+                stack.append(right[node])
+        return True
+
+    def inorder(self) -> List[Any]:
+        return list(self.irange())
+
+    def irange(
+        self, lo: Any = None, hi: Any = None, reverse: bool = False
+    ) -> Iterator[Any]:
+        vals = self._vals
+        # `near` child holds smaller values in iteration order
+        near, far = (self._right, self._left) if reverse else (self._left, self._right)
+
+        def before_start(val) -> bool:
+            if reverse:
+                return hi is not None and hi < val
+            return lo is not None and val < lo
+
+        def after_end(val) -> bool:
+            if reverse:
+                return lo is not None and val < lo
+            return hi is not None and hi < val
+
+        stack = []
+        node = _NIL if self.root is None else self.root
+        while node != _NIL:
+            if before_start(vals[node]):
+                node = far[node]
+            else:
+                stack.append(node)
+                node = near[node]
+        while stack:
+            node = stack.pop()
+            if after_end(vals[node]):
+                return
+            yield vals[node]
+            node = far[node]
+            while node != _NIL:
+                stack.append(node)
+                node = near[node]
+
+    def height(self) -> int:
+        if self.root is None:
+            return 0
+        left, right = self._left, self._right
+        height = -1
+        level = [self.root]
+        while level:
+            height += 1
+            level = [
+                ch for node in level for ch in (left[node], right[node]) if ch != _NIL
+            ]
+        return height
+
+    def get_successor(self, val: Any) -> Any:
+        if val not in self:
+            return -1
+        vals, left, right = self._vals, self._left, self._right
+        successor = _NIL
+        node = self.root
+        while node != _NIL:
+            if val < vals[node]:
+                successor = node
+                node = left[node]
+            else:
+                node = right[node]
+        return -1 if successor == _NIL else vals[successor]
+
+    def min(self) -> Optional[Any]:
+        return self._edge(self._left)
+
+    def max(self) -> Optional[Any]:
+        return self._edge(self._right)
+
+    def _edge(self, links: array) -> Optional[Any]:
+        if self.root is None:
+            return None
+        node = self.root
+        while links[node] != _NIL:
+            node = links[node]
+        return self._vals[node]
+
+    def select(self, k: int) -> Any:
+        if k < 0:
+            k += self._size
+        if k < 0 or k >= self._size:
+            raise IndexError("tree index out of range")
+        vals, left, right = self._vals, self._left, self._right
+        node = self.root
+        while True:
+            left_size = self._size_of(left[node])
+            if k < left_size:
+                node = left[node]
+            elif k > left_size:
+                k -= left_size + 1
+                node = right[node]
+            else:
+                return vals[node]
+
+    def _count_less(self, val: Any, inclusive: bool) -> int:
+        vals, left, right = self._vals, self._left, self._right
+        count = 0
+        node = _NIL if self.root is None else self.root
+        while node != _NIL:
+            if vals[node] < val or (inclusive and vals[node] == val):
+                count += self._size_of(left[node]) + 1
+                node = right[node]
+            else:
+                node = left[node]
+        return count
@@ -0,0 +1,119 @@
+"""Hash Map with the open addressing table in flat buffers"""
+
+from array import array
+from typing import Iterator, Tuple
+
+from dspy.hashmap import MyHashMap
+
+# slot states
+_EMPTY = 0
+_FULL = 1
+_DELETED = 2  # tombstone, DEL_FLAG of MyHashMap
+
+Table = Tuple[array, array, bytearray]
+
+
+class CompactHashMap(MyHashMap):
+    """MyHashMap which keeps the table in parallel buffers
+    instead of a list of Item tuples: keys and values in
+    `array('q')`, slot states in a bytearray. A slot takes
+    17 bytes and puts allocate nothing, while a full Item slot
+    takes a list pointer, a namedtuple and two int objects
+    (~120 bytes).
+
+    Probing, resizing and tombstone compaction are the ones
+    of MyHashMap. Keys and values must fit int64.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 32,
+        load_factor: float = 0.5,
+        tombstone_ratio: float = 0.25,
+        probing: str = "linear",
+    ):
+        super().__init__(capacity, load_factor, tombstone_ratio, probing)
+        self._table = self._make_table(self._cap)
+
+    @staticmethod
+    def _make_table(cap: int) -> Table:
+        return array("q", bytes(8 * cap)), array("q", bytes(8 * cap)), bytearray(cap)
+
+    def _find_slot(self, key: int, table: Table) -> Tuple[int, bool]:
+        keys, _, states = table
+        cap = len(states)
+        free = None
+        for trial in range(cap):
+            idx = self._key2idx(key, trial, cap)
+            state = states[idx]
+            if state == _EMPTY:
+                return (idx if free is None else free), False
+            if state == _DELETED:
+                if free is None:
+                    free = idx
+            elif keys[idx] == key:
+                return idx, True
+        if free is None:
+            raise RuntimeError("hash table is full")
+        return free, False
+
+    def _add_item(self, key: int, value: int, table: Table) -> bool:
+        idx, found = self._find_slot(key, table)
+        reused = table[2][idx] == _DELETED
+        self._store(table, idx, key, value)
+        if reused:
+            self._deleted -= 1
+        return not found
+
+    def _store(self, table: Table, idx: int, key: int, value: int):
+        keys, values, states = table
+        # out of int64 range fails here, before the slot is taken
+        keys[idx] = key
+        values[idx] = value
+        states[idx] = _FULL
+
+    def _rehash(self, cap: int):
+        keys, values, states = self._table
+        table = self._make_table(cap)
+        new_keys, new_values, new_states = table
+        for idx in range(self._cap):
+            if states[idx] == _FULL:
+                key = keys[idx]
+                trial = 0
+                pos = self._key2idx(key, trial, cap)
+                while new_states[pos] != _EMPTY:
+                    trial += 1
+                    pos = self._key2idx(key, trial, cap)
+                new_keys[pos] = key
+                new_values[pos] = values[idx]
+                new_states[pos] = _FULL
+        self._table = table
+        self._cap = cap
+        self._deleted = 0
+
+    def _stored_keys(self) -> Iterator[int]:
+        keys, _, states = self._table
+        return (keys[idx] for idx in range(self._cap) if states[idx] == _FULL)
+
+    def _probe_length(self, key: int) -> int:
+        keys, _, states = self._table
+        trial = 0
+        while True:
+            idx = self._key2idx(key, trial, self._cap)
+            if states[idx] == _FULL and keys[idx] == key:
+                return trial + 1
+            trial += 1
+
+    def get(self, key: int) -> int:
+        idx, found = self._find_slot(key, self._table)
+        return self._table[1][idx] if found else -1
+
+    def remove(self, key: int) -> None:
+        idx, found = self._find_slot(key, self._table)
+        if not found:
+            return
+        self._table[2][idx] = _DELETED
+        self._size -= 1
+        self._deleted += 1
+        if self._deleted > self._tombstone_ratio * self._cap:
+            self._rehash(self._cap)
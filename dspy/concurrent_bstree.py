@@ -0,0 +1,192 @@
+"""Thread-safe wrapper around BS Tree"""
+
+import threading
+from contextlib import contextmanager
+from typing import Any, Iterable, Iterator, List, Optional
+
+from dspy.bstree import AVLTree, BSTree
+
+
+class RWLock:
+    """Readers-writer lock: many readers or a single writer
+    at a time. Writer preferring, new readers wait while a
+    writer is waiting, so writers don't starve. Not reentrant.
+    """
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        with self._cond:
+            while self._writer or self._waiting_writers:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        with self._cond:
+            self._waiting_writers += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._waiting_writers -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = False
+                self._cond.notify_all()
+
+
+class ConcurrentBSTree:
+    """BS Tree shared between threads. Read operations run
+    in parallel under a shared lock, writes are serialised
+    under an exclusive one, so `insert` check-then-attach and
+    `_size` updates can't race. Batched writes take the lock
+    once per batch. Lookups with a value of the wrong type
+    are counted in `type_mismatches` of the tree under a lock
+    of their own, readers share the tree lock.
+    """
+
+    def __init__(self, tree: Optional[BSTree] = None) -> None:
+        self._tree = AVLTree() if tree is None else tree
+        self._lock = RWLock()
+        self._mismatch_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock.read():
+            return self._tree.get_node_count()
+
+    def __contains__(self, val: Any) -> bool:
+        with self._lock.read():
+            return self._has(val)
+
+    def find(self, val: Any) -> Optional[Any]:
+        """`val` if it is in the tree, None otherwise. Nodes
+        are not handed out: past the read lock a writer may
+        move values between them or unlink them
+
+        Args:
+            val (Any): value to find
+
+        Returns:
+            Optional[Any]: `val` or None
+        """
+        with self._lock.read():
+            return val if self._has(val) else None
+
+    def min(self) -> Optional[Any]:
+        with self._lock.read():
+            return self._tree.min()
+
+    def max(self) -> Optional[Any]:
+        with self._lock.read():
+            return self._tree.max()
+
+    def get_node_count(self) -> int:
+        return len(self)
+
+    def get_successor(self, val: Any) -> Any:
+        with self._lock.read():
+            if self._refused(val):
+                return -1
+            return self._tree.get_successor(val)
+
+    def height(self) -> int:
+        with self._lock.read():
+            return self._tree.height()
+
+    def inorder(self) -> List[Any]:
+        with self._lock.read():
+            return self._tree.inorder()
+
+    def irange(
+        self, lo: Any = None, hi: Any = None, reverse: bool = False
+    ) -> List[Any]:
+        """Range scan, unlike BSTree.irange values are collected
+        under the read lock and returned as a list, a lazy
+        generator would hold the lock for as long as it lives
+        """
+        with self._lock.read():
+            return list(self._tree.irange(lo, hi, reverse))
+
+    def rank(self, val: Any) -> int:
+        with self._lock.read():
+            return self._tree.rank(val)
+
+    def select(self, k: int) -> Any:
+        with self._lock.read():
+            return self._tree.select(k)
+
+    def count_range(self, lo: Any, hi: Any) -> int:
+        with self._lock.read():
+            return self._tree.count_range(lo, hi)
+
+    def _has(self, val: Any) -> bool:
+        # caller holds the read lock
+        return not self._refused(val) and val in self._tree
+
+    def _refused(self, val: Any) -> bool:
+        """Type check of a lookup done before the tree sees
+        `val` (caller holds the read lock, so the tree dtype
+        can't change). Concurrent readers would race on the
+        tree counter, a mismatch is counted under its own lock
+        """
+        tree = self._tree
+        if tree._trusted or tree.root is None:
+            return False  # the tree doesn't count these either
+        dtype = tree._dtype
+        if dtype is None or isinstance(val, dtype):
+            return False
+        with self._mismatch_lock:
+            tree.type_mismatches += 1
+        return True
+
+    def insert(self, val: Any) -> bool:
+        with self._lock.write():
+            return self._tree.insert(val)
+
+    def del_value(self, val: Any) -> bool:
+        with self._lock.write():
+            return self._tree.del_value(val)
+
+    def delete(self):
+        with self._lock.write():
+            self._tree.delete()
+
+    def insert_many(self, values: Iterable[Any]) -> int:
+        """Insert all `values` under a single write lock
+
+        Args:
+            values (Iterable[Any]): values to insert
+
+        Returns:
+            int: number of inserted values
+        """
+        values = list(values)  # don't run user code under the lock
+        with self._lock.write():
+            return sum(self._tree.insert(val) for val in values)
+
+    def delete_many(self, values: Iterable[Any]) -> int:
+        """Delete all `values` under a single write lock
+
+        Args:
+            values (Iterable[Any]): values to delete
+
+        Returns:
+            int: number of deleted values
+        """
+        values = list(values)
+        with self._lock.write():
+            return sum(self._tree.del_value(val) for val in values)
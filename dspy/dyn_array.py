@@ -1,63 +1,443 @@
 """Implementation of Dynamic Array"""
 import ctypes
-from typing import Any, Optional, Sequence
+import struct
+from array import array
+from bisect import insort
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional
+    np = None
+
+# typed mode element types -> struct (memoryview) format
+DTYPES = {
+    "i1": "b",
+    "i2": "h",
+    "i4": "i",
+    "i8": "q",
+    "u1": "B",
+    "u2": "H",
+    "u4": "I",
+    "u8": "Q",
+    "f4": "f",
+    "f8": "d",
+}
+
+_CHUNK = 1024  # elements sliced at once by iteration
+# moving a pointer in a list memmove is ~100x cheaper than copying
+# a reference (refcount and cache line of the element)
+_MEMMOVE_RATIO = 64
+
+
+class _ObjectSlots:
+    """Storage of boxed mode: a list of fixed length
+    (capacity), empty slots hold None, so the cyclic GC sees
+    the elements. One slot shifts are a `del` and a list
+    `insert`, a memmove of pointers which doesn't touch
+    refcounts of the shifted elements.
+    `owners` counts arrays (and views) sharing the slots.
+    """
+
+    __slots__ = ("objs", "owners")
+
+    def __init__(self, capacity: int) -> None:
+        self.owners = 0
+        self.objs = [None] * capacity
+
+    def set(self, idx: int, val: Any):
+        self.objs[idx] = val
+
+    def set_many(self, idx: int, values: Sequence[Any]):
+        """Fill empty slots from `idx` on with `values`"""
+        self.objs[idx : idx + len(values)] = values
+
+    def clear(self, idx: int):
+        """Empty the slot"""
+        self.objs[idx] = None
+
+    def move(self, dst: int, src: int, count: int):
+        """Copy `count` slots from `src` to `dst` (may overlap).
+        Vacated slots which are not overwritten still refer to
+        their old elements and must be `clear`-ed by the caller
+        """
+        objs = self.objs
+        objs[dst : dst + count] = objs[src : src + count]
+
+    def shift_right(self, idx: int, count: int, tail_empty: bool = False):
+        """Move `count` slots from `idx` one slot right, slot
+        `idx + count` is overwritten, slot `idx` becomes empty.
+        `tail_empty`: all slots from `idx + count` on are empty
+        """
+        objs = self.objs
+        if len(objs) - idx > _MEMMOVE_RATIO * count:
+            # a few slots before a long tail, copy them
+            self.move(idx + 1, idx, count)
+            objs[idx] = None
+            return
+        # list memmoves of the tail from `idx` on
+        del objs[-1 if tail_empty else idx + count]
+        objs.insert(idx, None)
+
+    def shift_left(self, idx: int, count: int, tail_empty: bool = False):
+        """Move `count` slots from `idx` one slot left, slot
+        `idx - 1` is overwritten, slot `idx + count - 1` becomes empty.
+        `tail_empty`: all slots from `idx + count` on are empty
+        """
+        objs = self.objs
+        if len(objs) - idx > _MEMMOVE_RATIO * count:
+            self.move(idx - 1, idx, count)
+            objs[idx + count - 1] = None
+            return
+        del objs[idx - 1]
+        if tail_empty:
+            objs.append(None)
+        else:
+            objs.insert(idx + count - 1, None)
+
+    def move_to(self, other: "_ObjectSlots", count: int, src: int = 0, dst: int = 0):
+        """Move `count` references from `src` into `other` slots at `dst`"""
+        other.objs[dst : dst + count] = self.objs[src : src + count]
+        self.objs[src : src + count] = [None] * count
+
+
+class _TypedSlots:
+    """Storage of typed mode: raw numbers in a bytearray,
+    `objs` is a memoryview cast to element format
+    """
+
+    __slots__ = ("objs", "owners")
+
+    def __init__(self, capacity: int, fmt: str) -> None:
+        self.owners = 0
+        self.objs = memoryview(bytearray(capacity * struct.calcsize(fmt))).cast(fmt)
+
+    def set(self, idx: int, val: Any):
+        self.objs[idx] = val
+
+    def set_many(self, idx: int, values: Sequence[Any]):
+        self.objs[idx : idx + len(values)] = values
+
+    def clear(self, idx: int):
+        pass
+
+    def move(self, dst: int, src: int, count: int):
+        # memoryview slice assignment is a memmove
+        self.objs[dst : dst + count] = self.objs[src : src + count]
+
+    def shift_right(self, idx: int, count: int, tail_empty: bool = False):
+        self.move(idx + 1, idx, count)
+
+    def shift_left(self, idx: int, count: int, tail_empty: bool = False):
+        self.move(idx - 1, idx, count)
+
+    def move_to(self, other: "_TypedSlots", count: int, src: int = 0, dst: int = 0):
+        other.objs[dst : dst + count] = self.objs[src : src + count]
+
+
+class _ValueIndex:
+    """Value -> positions of equal elements, for O(1) expected
+    `find`. A position is stored as `index + origin`, so adding
+    or removing the first element only moves `origin`. Values
+    with a single position map to an int, duplicates to a
+    sorted list. Shifts in the middle make the index `stale`,
+    it is rebuilt on the next lookup.
+    """
+
+    __slots__ = ("positions", "origin", "unhashable", "stale")
+
+    def __init__(self) -> None:
+        self.positions = {}
+        self.origin = 0
+        self.unhashable = 0  # elements which can't be indexed
+        self.stale = False
+
+    def add(self, val: Any, idx: int):
+        pos = idx + self.origin
+        if _unindexable(val):
+            self.unhashable += 1
+            return
+        held = self.positions.setdefault(val, pos)
+        if held == pos:
+            return
+        if isinstance(held, int):
+            held = self.positions[val] = [held]
+        insort(held, pos)
+
+    def discard(self, val: Any, idx: int):
+        pos = idx + self.origin
+        if _unindexable(val):
+            self.unhashable -= 1
+            return
+        held = self.positions.get(val)
+        if held is None:
+            return
+        if isinstance(held, int):
+            del self.positions[val]
+            return
+        if held[-1] == pos:
+            held.pop()
+        else:
+            held.remove(pos)
+        if len(held) == 1:
+            self.positions[val] = held[0]
+
+    def candidates(self, val: Any) -> Iterable[int]:
+        """Ascending indices of elements equal to `val`
+
+        Raises:
+            TypeError: if `val` is unhashable
+        """
+        held = self.positions.get(val)
+        if held is None:
+            return ()
+        if isinstance(held, int):
+            return (held - self.origin,)
+        return [pos - self.origin for pos in held]
+
+
+def _unindexable(val: Any) -> bool:
+    # unhashable, or NaN: a float read back from typed storage
+    # is a new object and NaN never equals itself, dict misses it
+    try:
+        hash(val)
+    except TypeError:
+        return True
+    return val != val
+
+
+class ResizePolicy:
+    """When and how much DynamicArray grows and shrinks
+
+    Args:
+        growth_factor (float, optional): full array capacity is
+        multiplied by it. Defaults to 2.0.
+        shrink_threshold (float, optional): array shrinks when
+        size < capacity * shrink_threshold. Defaults to 0.25.
+        min_capacity (int, optional): initial capacity of an empty
+        array, automatic shrinking never goes below. Defaults to 8.
+
+    Shrinking leaves `growth_factor` room (capacity becomes
+    size * growth_factor), so `shrink_threshold * growth_factor`
+    must be < 1: otherwise an array oscillating around a boundary
+    would shrink and grow again on every other operation.
+    """
+
+    def __init__(
+        self,
+        growth_factor: float = 2.0,
+        shrink_threshold: float = 0.25,
+        min_capacity: int = 8,
+    ) -> None:
+        if growth_factor <= 1:
+            raise ValueError("growth_factor must be > 1")
+        if not 0 <= shrink_threshold * growth_factor < 1:
+            raise ValueError("shrink_threshold * growth_factor must be in [0, 1)")
+        if min_capacity < 1:
+            raise ValueError("min_capacity must be >= 1")
+        self.growth_factor = growth_factor
+        self.shrink_threshold = shrink_threshold
+        self.min_capacity = min_capacity
+
+    def grow(self, capacity: int) -> int:
+        return max(capacity + 1, int(capacity * self.growth_factor))
+
+    def shrink(self, size: int, capacity: int) -> Optional[int]:
+        """New capacity if array should shrink, None otherwise"""
+        if capacity <= self.min_capacity or size >= capacity * self.shrink_threshold:
+            return None
+        return max(self.min_capacity, int(size * self.growth_factor))
 
 
 class DynamicArray:
     """Own implementation of dynamically
     resizable array data structure. Implementation
-    is using ctypes py_object to make a array similar
-    to python built-in list.
+    keeps boxed elements in a fixed-capacity Python
+    list, grown and shrunk by hand like a C array.
+
+    Typed mode (`dtype` one of DTYPES keys) stores raw
+    fixed-width numbers in a byte buffer instead of boxed
+    Python objects. Its content can be exported without
+    copying: `buffer()` (and `memoryview(arr)` on Python
+    3.12+) gives a memoryview, `numpy.asarray(arr)` a NumPy
+    array, both sharing memory with the array (until it is
+    resized, then they keep the old buffer). `numpy.array(arr)`
+    copies, and boxed arrays are always copied into NumPy.
+
+    Growth and shrinking follow a ResizePolicy, `resizes` and
+    `bytes_copied` count reallocations and bytes they moved.
+
+    With `indexed=True` a hash index of element positions makes
+    `find` and `in` O(1) expected (O(number of equal elements)
+    for duplicates). Appending, popping and setting keep it up
+    to date in O(1), an insert or delete in the middle marks it
+    stale and the next lookup rebuilds it in O(n). It costs
+    about 85 bytes per distinct element (dict entry and int
+    position; 115 in typed mode, where numbers are boxed again)
+    and 40 bytes per duplicate (int position in a list).
+    Unhashable elements and NaN can't be indexed, while any are
+    stored lookups fall back to a linear scan.
+
+    Slicing returns an ArrayView sharing storage with the array.
+    Storage is copied on write (by whichever side writes first),
+    except writes through exported `buffer()` views.
     """
 
-    def __init__(self, val: Optional[Sequence[Any]] = None) -> None:
-        self._cap = 8  # capacity
+    def __init__(
+        self,
+        val: Optional[Sequence[Any]] = None,
+        dtype: Optional[str] = None,
+        policy: Optional[ResizePolicy] = None,
+        indexed: bool = False,
+    ) -> None:
+        if dtype is not None and dtype not in DTYPES:
+            raise ValueError(f"Unknown dtype {dtype}, expected one of {list(DTYPES)}")
+        self._dtype = dtype
+        self.policy = ResizePolicy() if policy is None else policy
+        self.resizes = 0  # number of reallocations
+        self.bytes_copied = 0  # bytes moved by reallocations
+        self._cap = self.policy.min_capacity  # capacity
         self._size = 0  # number of populated elements
         if val:
-            self._cap = int(2 * len(val))
+            self._cap = max(self._cap, len(val))
 
-        self._arr = self._make_array(self._cap)
+        self._slots = None
+        self._set_storage(self._make_array(self._cap))
         if val:
             for i, v in enumerate(val):
-                self._arr[i] = v
+                self._slots.set(i, v)
                 self._size += 1
+        self._index = None
+        if indexed:
+            self._index_rebuild()
+
+    def __del__(self):
+        slots = getattr(self, "_slots", None)
+        if slots is not None:
+            slots.owners -= 1
 
     def __len__(self) -> int:
         return self._size
 
     def __getitem__(self, idx: int):
+        if isinstance(idx, slice):
+            return self._slice(idx)
         idx = self._normalize_idx(idx)
         self._raise_if_out_range(idx)
         return self._arr[idx]
 
+    def __iter__(self) -> Iterator[Any]:
+        for chunk in self._chunks(_CHUNK):
+            yield from chunk
+
     def __setitem__(self, idx: int, val: Any):
         idx = self._normalize_idx(idx)
         self._raise_if_out_range(idx)
-        self._arr[idx] = val
+        self._before_write()
+        pos = self._phys(idx)
+        index = self._index
+        if index is None or index.stale:
+            self._slots.set(pos, val)
+            return
+        old = self._arr[pos]
+        self._slots.set(pos, val)
+        index.discard(old, idx)
+        index.add(self._arr[pos], idx)
 
     def __delitem__(self, idx: int):
         """Delete element at index `idx`,
-        shift all trailing elements left [O(n) time]
+        shift all trailing elements left in C,
+        moving pointers (or raw numbers) only [O(n) time]
 
         Args:
             idx (int): index to delete
         """
         idx = self._normalize_idx(idx)
         self._raise_if_out_range(idx)
-        for i in range(idx, self._size - 1):
-            self._arr[i] = self._arr[i + 1]
+        self._before_write()
+        self._index_removed(idx)
+        self._slots.shift_left(idx + 1, self._size - idx - 1, tail_empty=True)
         self._size -= 1
+        self._slots.clear(self._size)
         self._maybe_shrink()
 
     def __contains__(self, val: Any) -> bool:
         return self.find(val) != -1
 
+    def __buffer__(self, flags: int) -> memoryview:
+        return self.buffer()
+
+    def __array__(self, dtype=None, copy=None):
+        if self._dtype is None:
+            # boxed elements have no raw buffer, copy them out
+            if copy is False:
+                raise ValueError("Boxed array can't be exported without a copy")
+            return np.array(list(self), dtype=dtype)
+        arr = np.asarray(self.buffer())
+        if dtype is None and not copy:
+            return arr
+        out = arr.astype(arr.dtype if dtype is None else dtype, copy=bool(copy))
+        if copy is False and out is not arr:
+            raise ValueError(f"{self._dtype} array needs a copy to be {dtype}")
+        return out
+
     def __repr__(self) -> str:
         return f"{__class__.__name__}(val=None)"
 
     def __str__(self) -> str:
         return "DynamicArray([" + ",".join(str(n) for n in self) + "])"
 
+    @property
+    def dtype(self) -> Optional[str]:
+        return self._dtype
+
+    @property
+    def itemsize(self) -> int:
+        """Bytes per element slot (a pointer in boxed mode)"""
+        if self._dtype is None:
+            return ctypes.sizeof(ctypes.py_object)
+        return self._arr.itemsize
+
+    @property
+    def capacity(self) -> int:
+        return self._cap
+
+    @property
+    def indexed(self) -> bool:
+        return self._index is not None
+
+    def reserve(self, capacity: int):
+        """Make room for at least `capacity` elements with a
+        single reallocation, no-op if there is enough room
+
+        Args:
+            capacity (int): number of elements to fit
+        """
+        if capacity > self._cap:
+            self._before_write()
+            self._resize(capacity)
+
+    def shrink_to_fit(self):
+        """Release unused capacity, capacity becomes size
+        (at least 1)
+        """
+        self._before_write()
+        if self._cap > max(self._size, 1):
+            self._resize(max(self._size, 1))
+
+    def buffer(self) -> memoryview:
+        """Zero-copy memoryview of populated elements (typed mode)
+
+        Raises:
+            TypeError: if array stores boxed Python objects
+
+        Returns:
+            memoryview: view sharing memory with the array
+        """
+        if self._dtype is None:
+            raise TypeError("Boxed array has no raw buffer, use dtype")
+        return self._arr[: self._size]
+
     def append(self, val: Any):
         """Push (pythonic append) amortized O(1)
 
@@ -65,14 +445,53 @@ class DynamicArray:
             val (Any): value to append to the end of
             the array
         """
+        self._before_write()
         self._maybe_grow()
-        self._arr[len(self)] = val
+        self._slots.set(self._size, val)
         self._size += 1
+        self._index_inserted(self._size - 1)
+
+    def extend(self, values: Iterable[Any]):
+        """Append all `values`, making room with at most one
+        resize. Typed values are packed into a buffer first and
+        copied in bulk, so on a bad value nothing is appended
+
+        Args:
+            values (Iterable[Any]): values to append
+
+        Raises:
+            TypeError, ValueError: if a value doesn't fit typed array
+        """
+        if self._dtype is None:
+            data = list(values)
+        elif isinstance(values, DynamicArray) and values.dtype == self._dtype:
+            data = values.buffer()
+        else:
+            try:
+                data = memoryview(array(DTYPES[self._dtype], values))
+            except OverflowError as exc:
+                raise ValueError(f"Value out of {self._dtype} range") from exc
+        if not len(data):
+            return
+        self._before_write()
+        start, end = self._size, self._size + len(data)
+        if end > self._cap:
+            self._resize(max(end, self.policy.grow(self._cap)))
+        done = 0
+        for pos, length in self._runs(start, len(data)):
+            self._slots.set_many(pos, data[done : done + length])
+            done += length
+        self._size = end
+        index = self._index
+        if index is not None and not index.stale:
+            for i in range(start, end):
+                index.add(self._arr[self._phys(i)], i)
 
     def insert(self, idx: int, val: Any):
         """Insert `val` at index `idx` and
         shift the rest of an array after `idx`
-        one step to the right. O(n) time
+        one step to the right in C, moving
+        pointers (or raw numbers) only. O(n) time
 
         Args:
             idx (int): valid array index
@@ -80,14 +499,19 @@ class DynamicArray:
         """
         idx = self._normalize_idx(idx)
         self._raise_if_out_range(idx)
+        self._before_write()
         self._maybe_grow()
 
-        end = len(self) - 1
-        for i in range(end, idx - 1, -1):
-            self._arr[i + 1] = self[i]
+        slots = self._slots
+        slots.shift_right(idx, self._size - idx, tail_empty=True)
+        try:
+            slots.set(idx, val)
+        except (TypeError, ValueError):
+            # value doesn't fit typed array, shift back
+            slots.shift_left(idx + 1, self._size - idx, tail_empty=True)
+            raise
         self._size += 1
-
-        self[idx] = val
+        self._index_inserted(idx)
 
     def prepend(self, val: Any):
         """Wrapper to insert at index 0
@@ -97,6 +521,22 @@ class DynamicArray:
         """
         self.insert(0, val)
 
+    def pop_front(self) -> Any:
+        """Delete first element and return its value, O(n)
+        (see CircularArray for O(1))
+
+        Raises:
+            IndexError: if trying to pop from empty list
+
+        Returns:
+            Any: value of the first element
+        """
+        if not self:
+            raise IndexError("Trying to pop from empty list")
+        val = self[0]
+        del self[0]
+        return val
+
     def pop(self) -> Any:
         """Delete last element and returns its value
 
@@ -109,12 +549,16 @@ class DynamicArray:
         if not self:
             raise IndexError("Trying to pop from empty list")
         val = self[-1]
+        self._before_write()
+        self._index_removed(self._size - 1)
         self._size -= 1
+        self._slots.clear(self._size)
         self._maybe_shrink()
         return val
 
     def find(self, val: Any) -> int:
-        """Looks for val in the array
+        """Looks for val in the array, O(1) expected if
+        array is indexed, O(n) otherwise
 
         Args:
             val (Any): value to find
@@ -124,33 +568,191 @@ class DynamicArray:
             -1 if not found
         """
         val_type = type(val)
+        index = self._index
+        if index is not None:
+            if index.stale:
+                index = self._index_rebuild()
+            try:
+                found = None if index.unhashable else index.candidates(val)
+            except TypeError:  # unhashable `val`
+                found = None
+            if found is not None:
+                for i in found:
+                    elem = self._arr[self._phys(i)]
+                    if isinstance(elem, val_type) and elem == val:
+                        return i
+                return -1
         for i, elem in enumerate(self):
             if isinstance(elem, val_type) and elem == val:
                 return i
         return -1
 
-    def remove(self, val: Any):
-        """Simple way to remove all values `val` in
-        our dynamic array. Collect all indices corresponding
-        to `val` and then use del on all found elements.
-        Most likely, not optimal.
+    def remove(self, val: Any) -> int:
+        """Remove all values `val` in a single O(n) pass
 
         Args:
             val (Any): value to delete from the list
+
+        Returns:
+            int: number of removed elements
         """
-        to_delete = []
         val_type = type(val)
+        return self.remove_if(lambda elem: isinstance(elem, val_type) and elem == val)
+
+    def remove_if(self, predicate: Callable[[Any], bool]) -> int:
+        """Remove all elements for which `predicate` is true.
+        Elements are tested first, so if `predicate` raises,
+        the array is left untouched. O(n) with at most one
+        resize
+
+        Args:
+            predicate (Callable[[Any], bool]): element test
+
+        Returns:
+            int: number of removed elements
+        """
+        return self._compact([i for i, elem in enumerate(self) if predicate(elem)])
+
+    def delete_many(self, indices: Iterable[int]) -> int:
+        """Delete elements at `indices` (any order, negative
+        and repeated indices are fine) in a single O(n) pass
+        with at most one resize
+
+        Args:
+            indices (Iterable[int]): indices to delete
+
+        Raises:
+            IndexError: if any index is out of range, nothing
+            is deleted then
+
+        Returns:
+            int: number of deleted elements
+        """
+        doomed = set()
+        for idx in indices:
+            idx = self._normalize_idx(idx)
+            self._raise_if_out_range(idx)
+            doomed.add(idx)
+        return self._compact(sorted(doomed))
+
+    def _compact(self, doomed: List[int]) -> int:
+        """Drop elements at sorted unique `doomed` indices,
+        move every run of kept elements left just once
+
+        Returns:
+            int: number of dropped elements
+        """
+        if not doomed:
+            return 0
+        self._before_write()
+        if self._index is not None:
+            self._index.stale = True
+        slots = self._slots
+        write = doomed[0]
+        for i, idx in enumerate(doomed):
+            slots.clear(self._phys(idx))
+            stop = doomed[i + 1] if i + 1 < len(doomed) else self._size
+            self._move(write, idx + 1, stop - idx - 1)
+            write += stop - idx - 1
+        # tail slots are either cleared or moved from
+        for idx in range(write, self._size):
+            slots.clear(self._phys(idx))
+        self._size = write
+        self._maybe_shrink()
+        return len(doomed)
+
+    def _phys(self, idx: int) -> int:
+        """Storage slot of index `idx`"""
+        return idx
+
+    def _runs(self, start: int, count: int):
+        """Contiguous storage runs (slot, length) of `count`
+        elements starting at index `start`
+        """
+        return [(start, count)] if count else []
+
+    def _stride(self) -> int:
+        """Storage slots between neighbour elements"""
+        return 1
+
+    def _chunks(self, size: int) -> Iterator[Sequence[Any]]:
+        """Elements in index order, sliced out of the storage
+        at most `size` at a time (lists or memoryviews)
+        """
+        idx = 0
+        while idx < self._size:
+            for pos, length in self._runs(idx, min(size, self._size - idx)):
+                chunk = self._arr[pos : pos + length]
+                yield chunk
+                idx += len(chunk)
+
+    def _slice(self, key: slice) -> "DynamicArray":
+        start, stop, step = key.indices(self._size)
+        return ArrayView(self, start, step, len(range(start, stop, step)))
+
+    def _before_write(self):
+        """Copy storage shared with views before changing it"""
+        if self._slots.owners > 1:
+            self._unshare()
+
+    def _unshare(self):
+        """Move to a private copy of the storage"""
+        slots = self._make_array(self._cap)
+        dst = 0
+        for chunk in self._chunks(max(self._size, 1)):
+            slots.set_many(dst, chunk)
+            dst += len(chunk)
+        self._set_storage(slots)
+        self.bytes_copied += self._size * self.itemsize
+
+    def _index_rebuild(self) -> _ValueIndex:
+        index = _ValueIndex()
         for i, elem in enumerate(self):
-            if isinstance(elem, val_type) and elem == val:
-                to_delete.append(i)
-        # deleting indexes starting from begining of the list
-        # will change all following indexes and they will point
-        # to wrong values
-        for i in reversed(to_delete):
-            del self[i]
+            index.add(elem, i)
+        self._index = index
+        return index
+
+    def _index_inserted(self, idx: int):
+        """Update index after an element was inserted at `idx`"""
+        index = self._index
+        if index is None or index.stale:
+            return
+        if idx == self._size - 1:
+            index.add(self._arr[self._phys(idx)], idx)
+        elif idx == 0:
+            index.origin -= 1
+            index.add(self._arr[self._phys(0)], 0)
+        else:
+            index.stale = True
+
+    def _index_removed(self, idx: int):
+        """Update index before an element at `idx` is removed"""
+        index = self._index
+        if index is None or index.stale:
+            return
+        if idx == self._size - 1:
+            index.discard(self._arr[self._phys(idx)], idx)
+        elif idx == 0:
+            index.discard(self._arr[self._phys(0)], 0)
+            index.origin += 1
+        else:
+            index.stale = True
+
+    def _move(self, dst: int, src: int, count: int):
+        """Move `count` elements from index `src` to `dst`"""
+        self._slots.move(dst, src, count)
 
     def _make_array(self, capacity: int):
-        return (capacity * ctypes.py_object)()
+        if self._dtype is None:
+            return _ObjectSlots(capacity)
+        return _TypedSlots(capacity, DTYPES[self._dtype])
+
+    def _set_storage(self, slots):
+        if self._slots is not None:
+            self._slots.owners -= 1
+        slots.owners += 1
+        self._slots = slots
+        self._arr = slots.objs  # indexable, for reads
 
     def _resize(self, new_cap: int):
         """Resize dynamic array to have new capacity
@@ -160,11 +762,12 @@ class DynamicArray:
         Args:
             new_cap (int): new capacity size
         """
-        _arr = self._make_array(new_cap)
+        slots = self._make_array(new_cap)
+        self._slots.move_to(slots, self._size)
         self._cap = new_cap
-        for i, v in enumerate(self):
-            _arr[i] = v
-        self._arr = _arr
+        self._set_storage(slots)
+        self.resizes += 1
+        self.bytes_copied += self._size * self.itemsize
 
     def _raise_if_out_range(self, idx: int):
         if idx >= self._size or idx < 0:
@@ -173,12 +776,13 @@ class DynamicArray:
     def _maybe_grow(self):
         """Helpper to increase capacity"""
         if len(self) == self._cap:
-            self._resize(self._cap * 2)
+            self._resize(self.policy.grow(self._cap))
 
     def _maybe_shrink(self):
         """Helpper to decrease capacity"""
-        if len(self) < self._cap // 4:
-            self._resize(self._cap // 2)
+        new_cap = self.policy.shrink(self._size, self._cap)
+        if new_cap is not None:
+            self._resize(new_cap)
 
     def _normalize_idx(self, idx: int) -> int:
         """Helper to convert index to its
@@ -196,3 +800,292 @@ class DynamicArray:
             return idx
         else:
             return len(self) + idx
+
+
+class CircularArray(DynamicArray):
+    """DynamicArray stored as a ring buffer: elements start
+    at `_head` slot and wrap around the end of the storage.
+    Adding or removing at either end is amortized O(1)
+    (`append`, `prepend`, `pop`, `pop_front`), insert/delete
+    in the middle shift the shorter side, in at most 3 moves.
+    Indexing, iteration and resizing work like in DynamicArray,
+    resizing also unwraps elements to start at slot 0.
+    """
+
+    def __init__(
+        self,
+        val: Optional[Sequence[Any]] = None,
+        dtype: Optional[str] = None,
+        policy: Optional[ResizePolicy] = None,
+        indexed: bool = False,
+    ) -> None:
+        self._head = 0  # slot of the first element
+        super().__init__(val=val, dtype=dtype, policy=policy, indexed=indexed)
+
+    def __getitem__(self, idx: int):
+        if isinstance(idx, slice):
+            return self._slice(idx)
+        idx = self._normalize_idx(idx)
+        self._raise_if_out_range(idx)
+        return self._arr[self._phys(idx)]
+
+    def __delitem__(self, idx: int):
+        """Delete element at index `idx`, shift the shorter
+        side of the array towards it [O(min(idx, n - idx))]
+
+        Args:
+            idx (int): index to delete
+        """
+        idx = self._normalize_idx(idx)
+        self._raise_if_out_range(idx)
+        self._before_write()
+        self._index_removed(idx)
+        self._slots.clear(self._phys(idx))
+        if idx < self._size // 2:
+            self._shift(0, idx, 1)
+            self._slots.clear(self._head)
+            self._head = self._phys(1)
+        else:
+            self._shift(idx + 1, self._size - idx - 1, -1)
+            self._slots.clear(self._phys(self._size - 1))
+        self._size -= 1
+        self._maybe_shrink()
+
+    def buffer(self) -> memoryview:
+        """Zero-copy memoryview of populated elements (typed mode).
+        If elements wrap around the storage end, they are first
+        unwrapped by a reallocation of the same capacity
+        """
+        if self._dtype is None:
+            raise TypeError("Boxed array has no raw buffer, use dtype")
+        self._unwrap()
+        return self._arr[self._head : self._head + self._size]
+
+    def append(self, val: Any):
+        self._before_write()
+        self._maybe_grow()
+        self._slots.set(self._phys(self._size), val)
+        self._size += 1
+        self._index_inserted(self._size - 1)
+
+    def prepend(self, val: Any):
+        """Add `val` in front of the first element, amortized O(1)
+
+        Args:
+            val (Any): value to prepend
+        """
+        self._before_write()
+        self._maybe_grow()
+        head = (self._head - 1) % self._cap
+        self._slots.set(head, val)
+        self._head = head
+        self._size += 1
+        self._index_inserted(0)
+
+    def insert(self, idx: int, val: Any):
+        """Insert `val` at index `idx`, shift the shorter side
+        of the array away from it [O(min(idx, n - idx))]
+
+        Args:
+            idx (int): valid array index
+            val (Any): value to insert
+        """
+        idx = self._normalize_idx(idx)
+        self._raise_if_out_range(idx)
+        self._before_write()
+        self._maybe_grow()
+
+        front = idx < self._size // 2
+        if front:
+            self._shift(0, idx, -1)
+            self._head = self._phys(-1)
+        else:
+            self._shift(idx, self._size - idx, 1)
+        pos = self._phys(idx)
+        self._slots.clear(pos)
+        try:
+            self._slots.set(pos, val)
+        except (TypeError, ValueError):
+            # value doesn't fit typed array, shift back
+            if front:
+                self._head = self._phys(1)
+                self._shift(-1, idx, 1)
+            else:
+                self._shift(idx + 1, self._size - idx, -1)
+            raise
+        self._size += 1
+        self._index_inserted(idx)
+
+    def pop(self) -> Any:
+        if not self:
+            raise IndexError("Trying to pop from empty list")
+        self._before_write()
+        pos = self._phys(self._size - 1)
+        val = self._arr[pos]
+        self._index_removed(self._size - 1)
+        self._slots.clear(pos)
+        self._size -= 1
+        self._maybe_shrink()
+        return val
+
+    def pop_front(self) -> Any:
+        """Delete first element and return its value, amortized O(1)
+
+        Raises:
+            IndexError: if trying to pop from empty list
+
+        Returns:
+            Any: value of the first element
+        """
+        if not self:
+            raise IndexError("Trying to pop from empty list")
+        self._before_write()
+        val = self._arr[self._head]
+        self._index_removed(0)
+        self._slots.clear(self._head)
+        self._head = self._phys(1)
+        self._size -= 1
+        self._maybe_shrink()
+        return val
+
+    def _phys(self, idx: int) -> int:
+        """Storage slot of (logical) index `idx`"""
+        return (self._head + idx) % self._cap
+
+    def _slice(self, key: slice) -> DynamicArray:
+        self._unwrap()  # views need evenly spaced slots
+        return super()._slice(key)
+
+    def _unwrap(self):
+        """Make elements start at `_head` without wrapping"""
+        if self._head + self._size > self._cap:
+            if self._slots.owners > 1:
+                self._unshare()
+            else:
+                self._resize(self._cap)
+
+    def _unshare(self):
+        super()._unshare()
+        self._head = 0
+
+    def _move(self, dst: int, src: int, count: int):
+        """Move `count` elements from index `src` to `dst <= src`
+        in pieces which wrap neither source nor target
+        """
+        slots, cap = self._slots, self._cap
+        while count:
+            from_pos, to_pos = self._phys(src), self._phys(dst)
+            length = min(count, cap - from_pos, cap - to_pos)
+            slots.move(to_pos, from_pos, length)
+            src, dst, count = src + length, dst + length, count - length
+
+    def _runs(self, start: int, count: int):
+        """Contiguous storage runs (slot, length) of `count`
+        elements starting at index `start`, at most two
+        """
+        pos = self._phys(start)
+        first = min(count, self._cap - pos)
+        runs = [(pos, first)] if first else []
+        if count > first:
+            runs.append((0, count - first))
+        return runs
+
+    def _shift(self, start: int, count: int, step: int):
+        """Move `count` elements from index `start` one slot
+        right (`step` 1) or left (`step` -1), wrapping around
+        the storage end. Target slot must be free
+        """
+        slots, cap = self._slots, self._cap
+        if step > 0:
+            for pos, length in reversed(self._runs(start, count)):
+                if pos + length == cap:  # last one wraps to slot 0
+                    slots.move(0, cap - 1, 1)
+                    length -= 1
+                slots.shift_right(pos, length)
+        else:
+            for pos, length in self._runs(start, count):
+                if pos == 0:  # first one wraps to the last slot
+                    slots.move(cap - 1, 0, 1)
+                    slots.shift_left(1, length - 1)
+                else:
+                    slots.shift_left(pos, length)
+
+    def _resize(self, new_cap: int):
+        slots = self._make_array(new_cap)
+        dst = 0
+        for pos, length in self._runs(0, self._size):
+            self._slots.move_to(slots, length, src=pos, dst=dst)
+            dst += length
+        self._head = 0
+        self._cap = new_cap
+        self._set_storage(slots)
+        self.resizes += 1
+        self.bytes_copied += self._size * self.itemsize
+
+
+class ArrayView(DynamicArray):
+    """Slice of a DynamicArray sharing its storage: element
+    `idx` is storage slot `start + idx * step`. Reading and
+    slicing further are O(1) per element without copying, the
+    first change copies the elements into private storage and
+    the view becomes a regular (contiguous) array.
+    """
+
+    def __init__(self, parent: DynamicArray, start: int, step: int, size: int) -> None:
+        """
+        Args:
+            parent (DynamicArray): array to look into
+            start (int): index of the first element in `parent`
+            step (int): slice step
+            size (int): number of elements
+        """
+        self._dtype = parent.dtype
+        self.policy = parent.policy
+        self.resizes = 0
+        self.bytes_copied = 0
+        self._index = None
+        self._cap = size
+        self._size = size
+        self._start = parent._phys(start) if size else 0
+        self._step = parent._stride() * step
+        self._slots = None
+        self._set_storage(parent._slots)
+
+    def __getitem__(self, idx: int):
+        if isinstance(idx, slice):
+            return self._slice(idx)
+        idx = self._normalize_idx(idx)
+        self._raise_if_out_range(idx)
+        return self._arr[self._start + idx * self._step]
+
+    def __repr__(self) -> str:
+        return f"{__class__.__name__}(size={self._size})"
+
+    def buffer(self) -> memoryview:
+        """Zero-copy (possibly strided) memoryview of elements"""
+        if self._dtype is None:
+            raise TypeError("Boxed array has no raw buffer, use dtype")
+        return next(self._chunks(max(self._size, 1)), self._arr[:0])
+
+    def _phys(self, idx: int) -> int:
+        return self._start + idx * self._step
+
+    def _stride(self) -> int:
+        return self._step
+
+    def _chunks(self, size: int) -> Iterator[Sequence[Any]]:
+        idx, step = 0, self._step
+        while idx < self._size:
+            count = min(size, self._size - idx)
+            pos = self._start + idx * step
+            stop = pos + count * step
+            # negative step past slot 0 must slice to the start
+            chunk = self._arr[pos : stop if stop >= 0 else None : step]
+            yield chunk
+            idx += len(chunk)
+
+    def _before_write(self):
+        if self._slots.owners > 1 or self._start or self._step != 1:
+            self._cap = max(self._size, self.policy.min_capacity)
+            self._unshare()
+            self._start, self._step = 0, 1
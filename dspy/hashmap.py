@@ -17,70 +17,318 @@ or -1 if this map contains no mapping for the key.
 """
 
 
-from collections import namedtuple
-from typing import Any, List, Optional
+from collections import Counter, namedtuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 DEL_FLAG = "_DEL_"
 
 Item = namedtuple("Item", ["key", "value"])
 
+# probe sequences, all visit every slot of a power of two table
+PROBING = ("linear", "quadratic", "double")
+# splitmix64 finalizer constants, mix keys into double hashing steps
+_GOLDEN = 0x9E3779B97F4A7C15  # 2**64 / golden ratio
+_MIX1 = 0xBF58476D1CE4E5B9
+_MIX2 = 0x94D049BB133111EB
+_MASK64 = (1 << 64) - 1
+
 
 class MyHashMap:
-    """Open Addressing Implementation"""
+    """Open Addressing Implementation. Removed items leave
+    DEL_FLAG tombstones, so probe sequences of other keys stay
+    intact. Items and tombstones together are kept below
+    `load_factor` of the table: when they reach it, the table
+    is rehashed in bulk, twice as big if items need the room,
+    same size (dropping tombstones) otherwise. Tombstones are
+    also compacted away once they take `tombstone_ratio` of
+    the table.
+
+    `probing` picks the probe sequence: "linear" (`hash(key)
+    + trial`, sequential keys fill a solid run other keys
+    have to walk), "quadratic" (`+ trial * (trial + 1) / 2`,
+    runs are left in growing jumps) or "double" (`+ trial *
+    step`, odd step from mixed key bits, no shared sequences).
+    `probe_stats()` shows how well it suits stored keys.
+    """
 
-    def __init__(self):
-        self._cap = 32
+    def __init__(
+        self,
+        capacity: int = 32,
+        load_factor: float = 0.5,
+        tombstone_ratio: float = 0.25,
+        probing: str = "linear",
+    ):
+        """
+        Args:
+            capacity (int, optional): initial table size, rounded
+            up to a power of two. Defaults to 32.
+            load_factor (float, optional): max share of used (item
+            or tombstone) slots. Defaults to 0.5.
+            tombstone_ratio (float, optional): max share of
+            tombstone slots. Defaults to 0.25.
+            probing (str, optional): probe sequence, one of
+            PROBING. Defaults to "linear".
+
+        Raises:
+            ValueError: if ratios are not in (0, 1) or probing
+            is unknown
+        """
+        if not 0 < load_factor < 1 or not 0 < tombstone_ratio < 1:
+            raise ValueError("load_factor and tombstone_ratio must be in (0, 1)")
+        if probing not in PROBING:
+            raise ValueError(f"Unknown probing {probing}, expected one of {PROBING}")
+        # picked once, _key2idx runs on every probe
+        self._key2idx = {
+            "linear": self._linear_idx,
+            "quadratic": self._quadratic_idx,
+            "double": self._double_idx,
+        }[probing]
+        self._cap = 1 << max(capacity - 1, 1).bit_length()
         self._size = 0
+        self._deleted = 0  # tombstones
+        self._load_factor = load_factor
+        self._tombstone_ratio = tombstone_ratio
         self._table = [None] * self._cap
         self._hashfn = hash
 
-    def _hash(self, key: int, trial: int) -> int:
-        """Hash function for open addressing
-        hashmap implementation
+    def __len__(self) -> int:
+        return self._size
+
+    def _linear_idx(self, key: int, trial: int, m: int) -> int:
+        """Convert key to internal table index
 
         Args:
             key (int): key
             trial (int): attempt to find open address
+            m (int): table size
 
         Returns:
-            int: hash from key + trial
+            int: table index, hash of key shifted by trial (not
+            hash of key + trial: hash(-1) == hash(-2) would
+            repeat a slot)
         """
-        return hash(key + trial)
+        return (hash(key) + trial) % m
 
-    def _key2idx(self, key: int, trial: int, m: int) -> int:
-        """Convert key to internal table index
+    def _quadratic_idx(self, key: int, trial: int, m: int) -> int:
+        return (hash(key) + trial * (trial + 1) // 2) % m
 
-        Args:
-            key (int): key
-            m (int): table size
+    def _double_idx(self, key: int, trial: int, m: int) -> int:
+        if not trial:
+            return hash(key) % m  # most lookups stop here, skip the step
+        return (hash(key) + trial * self._step(key)) % m
+
+    @staticmethod
+    def _step(key: int) -> int:
+        """Odd double hashing step, splitmix64 of `hash(key)`:
+        every key bit affects every step bit, so consecutive
+        keys don't get steps in an arithmetic progression
+        """
+        z = (hash(key) + _GOLDEN) & _MASK64
+        z = (z ^ (z >> 30)) * _MIX1 & _MASK64
+        z = (z ^ (z >> 27)) * _MIX2 & _MASK64
+        return z ^ (z >> 31) | 1
+
+    def probe_stats(self) -> Dict[str, Any]:
+        """Probe lengths (slots looked at) of lookups of all
+        stored keys
 
         Returns:
-            int: table index
+            Dict[str, Any]: "mean" and "max" probe length and
+            "histogram", {probe length: number of keys}
         """
-        return self._hash(key, trial) % m
+        lengths = Counter(self._probe_length(key) for key in self._stored_keys())
+        total = sum(length * count for length, count in lengths.items())
+        return {
+            "mean": total / self._size if self._size else 0.0,
+            "max": max(lengths, default=0),
+            "histogram": dict(sorted(lengths.items())),
+        }
 
-    def _add_item(self, key: int, value: int, table: List[Optional[Item]]) -> None:
+    def _stored_keys(self) -> Iterator[int]:
+        for item in self._table:
+            if item is not None and item is not DEL_FLAG:
+                yield item.key
+
+    def _probe_length(self, key: int) -> int:
+        """Number of slots a lookup of stored `key` looks at"""
         trial = 0
-        cap = len(table)
-        item = Item(key, value)
-        idx = self._key2idx(key, trial, cap)
-        while table[idx] not in [None, DEL_FLAG]:
-            # update
-            if table[idx].key == item.key:
-                table[idx] = item
+        while True:
+            item = self._table[self._key2idx(key, trial, self._cap)]
+            if item is not DEL_FLAG and item.key == key:
+                return trial + 1
             trial += 1
+
+    def _find_slot(self, key: int, table: List[Any]) -> Tuple[int, bool]:
+        """Probe `table` for `key`
+
+        Args:
+            key (int): key
+            table (List[Any]): table to probe
+
+        Returns:
+            Tuple[int, bool]: index of `key` item and True if it
+            is there, otherwise index to put it at (first
+            tombstone on the way or empty slot) and False
+        """
+        cap = len(table)
+        free = None
+        for trial in range(cap):
             idx = self._key2idx(key, trial, cap)
-        # open address, can add item
-        table[idx] = item
+            item = table[idx]
+            if item is None:
+                return (idx if free is None else free), False
+            if item is DEL_FLAG:
+                if free is None:
+                    free = idx
+            elif item.key == key:
+                return idx, True
+        if free is None:
+            raise RuntimeError("hash table is full")
+        return free, False
+
+    def _add_item(self, key: int, value: int, table: List[Optional[Item]]) -> bool:
+        """Put `key` item into `table`, update if it is there.
+        A reused tombstone is taken off the count (only the
+        live table holds tombstones)
+
+        Returns:
+            bool: True if a new item was added
+        """
+        idx, found = self._find_slot(key, table)
+        if table[idx] is DEL_FLAG:
+            self._deleted -= 1
+        table[idx] = Item(key, value)
+        return not found
+
+    def _rehash(self, cap: int):
+        """Move all items into a new table of `cap` slots,
+        tombstones are dropped
+        """
+        table = [None] * cap
+        for item in self._table:
+            if item is not None and item is not DEL_FLAG:
+                # keys are unique, first empty slot is the place
+                trial = 0
+                idx = self._key2idx(item.key, trial, cap)
+                while table[idx] is not None:
+                    trial += 1
+                    idx = self._key2idx(item.key, trial, cap)
+                table[idx] = item
+        self._table = table
+        self._cap = cap
+        self._deleted = 0
+
+    def _maybe_grow(self):
+        limit = self._load_factor * self._cap
+        if self._size + self._deleted + 1 <= limit:
+            return
+        # grow only if items alone would be over half the limit,
+        # otherwise tombstones took the room, compact them
+        self._rehash(self._cap * 2 if self._size + 1 > limit / 2 else self._cap)
 
     def put(self, key: int, value: int) -> None:
-        raise NotImplementedError
+        self._maybe_grow()
+        if self._add_item(key, value, self._table):
+            self._size += 1
 
     def get(self, key: int) -> int:
-        raise NotImplementedError
+        idx, found = self._find_slot(key, self._table)
+        return self._table[idx].value if found else -1
+
+    def remove(self, key: int) -> None:
+        idx, found = self._find_slot(key, self._table)
+        if not found:
+            return
+        self._table[idx] = DEL_FLAG
+        self._size -= 1
+        self._deleted += 1
+        if self._deleted > self._tombstone_ratio * self._cap:
+            self._rehash(self._cap)
+
+
+class RobinHoodHashMap(MyHashMap):
+    """Linear probing with Robin Hood insertion: an item
+    further from its home slot (`hash(key) % cap`) takes
+    the slot of a closer one, which moves on. Distances
+    along a run never drop by more than one, so a lookup
+    stops as soon as it is further than the slot's item,
+    and probe lengths stay short and even. Removal shifts
+    the rest of the run one slot back, no tombstones are
+    ever left (`tombstone_ratio` is unused).
+    """
+
+    def __init__(
+        self,
+        capacity: int = 32,
+        load_factor: float = 0.5,
+        tombstone_ratio: float = 0.25,
+    ):
+        super().__init__(capacity, load_factor, tombstone_ratio)
+
+    def _dist(self, key: int, idx: int, cap: int) -> int:
+        """Distance of slot `idx` from `key` home slot"""
+        return (idx - hash(key)) & (cap - 1)
+
+    def _find_slot(self, key: int, table: List[Any]) -> Tuple[int, bool]:
+        mask = len(table) - 1
+        idx = hash(key) & mask
+        dist = 0
+        while True:
+            item = table[idx]
+            if item is None:
+                return idx, False
+            if item.key == key:
+                return idx, True
+            if self._dist(item.key, idx, mask + 1) < dist:
+                return idx, False  # `key` would have taken this slot
+            idx = (idx + 1) & mask
+            dist += 1
+
+    def _add_item(self, key: int, value: int, table: List[Optional[Item]]) -> bool:
+        mask = len(table) - 1
+        item = Item(key, value)
+        idx = hash(key) & mask
+        dist = 0
+        while True:
+            held = table[idx]
+            if held is None:
+                table[idx] = item
+                return True
+            if held.key == item.key:
+                table[idx] = item
+                return False
+            held_dist = self._dist(held.key, idx, mask + 1)
+            if held_dist < dist:
+                # take from the rich: closer item moves on
+                table[idx], item, dist = item, held, held_dist
+            idx = (idx + 1) & mask
+            dist += 1
+
+    def _rehash(self, cap: int):
+        table = [None] * cap
+        for item in self._table:
+            if item is not None:
+                self._add_item(item.key, item.value, table)
+        self._table = table
+        self._cap = cap
+
+    def _probe_length(self, key: int) -> int:
+        idx, _ = self._find_slot(key, self._table)
+        return self._dist(key, idx, self._cap) + 1
 
     def remove(self, key: int) -> None:
-        raise NotImplementedError
+        table = self._table
+        idx, found = self._find_slot(key, table)
+        if not found:
+            return
+        mask = self._cap - 1
+        nxt = (idx + 1) & mask
+        # backward shift: pull the run back until an item at home
+        while table[nxt] is not None and self._dist(table[nxt].key, nxt, mask + 1):
+            table[idx] = table[nxt]
+            idx, nxt = nxt, (nxt + 1) & mask
+        table[idx] = None
+        self._size -= 1
 
 
 # Your MyHashMap object will be instantiated and called as such:
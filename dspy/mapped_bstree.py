@@ -0,0 +1,204 @@
+"""Binary dump of BS Tree values and memory-mapped read-only tree
+
+File layout (native byte order, recorded in the header):
+
+- header, 24 bytes: magic b"DSPYBST1", kind (b"q" int64, b"d" float64,
+  b"s" str), byte order (b"<" or b">"), 6 pad bytes, number of values
+  (uint64)
+- numbers: sorted values as a packed fixed-width array
+- strings: (n + 1) uint64 offsets (from file start) of records, then
+  records: uint32 length + utf-8 bytes, in sorted order
+
+Sorted fixed-width (or offset-indexed) values can be binary searched
+right in the mapping, so loading is O(1), no TreeNode is ever built,
+and the page cache, not the Python heap, holds the data.
+"""
+
+import mmap as _mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Any, Iterator, List, Optional
+
+MAGIC = b"DSPYBST1"
+_HEADER = struct.Struct("=8sccxxxxxxQ")
+_OFFSET = struct.Struct("=Q")
+_LENGTH = struct.Struct("=I")
+_KINDS = {int: b"q", float: b"d", str: b"s"}
+_ORDER = b"<" if sys.byteorder == "little" else b">"
+
+
+def dump(values: List[Any], dtype: Optional[type], path: str):
+    """Write sorted unique `values` of `dtype` to `path`
+
+    Args:
+        values (List[Any]): sorted unique values
+        dtype (Optional[type]): values type (None for empty)
+        path (str): file to write
+
+    Raises:
+        ValueError: if values type is not supported
+    """
+    if dtype is None:
+        dtype = int  # empty tree, any kind will do
+    if dtype not in _KINDS:
+        raise ValueError(f"Can't dump values of type {dtype}")
+    kind = _KINDS[dtype]
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, kind, _ORDER, len(values)))
+        if kind != b"s":
+            try:
+                array(kind.decode(), values).tofile(f)
+            except OverflowError as exc:
+                raise ValueError(f"Value out of {kind.decode()} range") from exc
+            return
+        records = [v.encode() for v in values]
+        offset = _HEADER.size + _OFFSET.size * (len(records) + 1)
+        offsets = array("Q")
+        for rec in records:
+            offsets.append(offset)
+            offset += _LENGTH.size + len(rec)
+        offsets.append(offset)
+        offsets.tofile(f)
+        for rec in records:
+            f.write(_LENGTH.pack(len(rec)))
+            f.write(rec)
+
+
+def read_values(path: str) -> List[Any]:
+    """Read all values of a dump into a list"""
+    with MappedBSTree(path) as tree:
+        return tree.inorder()
+
+
+class _StrRecords:
+    """Sequence view over string records, items are raw utf-8
+    bytes (bytewise order of utf-8 equals code point order)
+    """
+
+    def __init__(self, buf: _mmap.mmap, offsets: memoryview) -> None:
+        self._buf = buf
+        self._offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, idx: int) -> bytes:
+        start = self._offsets[idx] + _LENGTH.size
+        return self._buf[start : self._offsets[idx + 1]]
+
+
+class MappedBSTree:
+    """Read-only BS Tree over a memory-mapped dump. Every query
+    binary searches the mapping: the implicit tree is perfectly
+    balanced, so lookups are O(log n), opening a file is O(1).
+    Node handles are value positions (like CompactBSTree slots).
+    """
+
+    def __init__(self, path: str) -> None:
+        self._file = open(path, "rb")
+        try:
+            self._buf = _mmap.mmap(self._file.fileno(), 0, access=_mmap.ACCESS_READ)
+        except ValueError:  # can't map an empty file
+            self._file.close()
+            raise ValueError(f"{path} is not a tree dump")
+        if len(self._buf) < _HEADER.size:
+            self.close()
+            raise ValueError(f"{path} is not a tree dump")
+        magic, kind, order, size = _HEADER.unpack_from(self._buf)
+        if magic != MAGIC or kind not in _KINDS.values():
+            self.close()
+            raise ValueError(f"{path} is not a tree dump")
+        if order != _ORDER:
+            self.close()
+            raise ValueError(f"{path} was written with other byte order")
+        self._size = size
+        self._dtype = next(t for t, k in _KINDS.items() if k == kind)
+        body = memoryview(self._buf)[_HEADER.size :]
+        if kind == b"s":
+            self._views = [body[: _OFFSET.size * (size + 1)].cast("Q")]
+            self._keys = _StrRecords(self._buf, self._views[0])
+        else:
+            self._views = [body[: size * 8].cast(kind.decode())]
+            self._keys = self._views[0]
+        self._views.append(body)
+
+    def __enter__(self) -> "MappedBSTree":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        # views must be released before the mapping is closed
+        for view in getattr(self, "_views", []):
+            view.release()
+        self._views = []
+        self._buf.close()
+        self._file.close()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, val: Any) -> bool:
+        return self.find(val) is not None
+
+    def get_node_count(self) -> int:
+        return self._size
+
+    def find(self, val: Any) -> Optional[int]:
+        """Position of `val` in sorted order or None"""
+        if not isinstance(val, self._dtype):
+            return None
+        key = self._key(val)
+        idx = bisect_left(self._keys, key)
+        if idx < self._size and self._keys[idx] == key:
+            return idx
+        return None
+
+    def rank(self, val: Any) -> int:
+        return bisect_left(self._keys, self._key(val))
+
+    def select(self, k: int) -> Any:
+        if k < 0:
+            k += self._size
+        if k < 0 or k >= self._size:
+            raise IndexError("tree index out of range")
+        return self._value(k)
+
+    def count_range(self, lo: Any, hi: Any) -> int:
+        if hi < lo:
+            return 0
+        return bisect_right(self._keys, self._key(hi)) - self.rank(lo)
+
+    def irange(
+        self, lo: Any = None, hi: Any = None, reverse: bool = False
+    ) -> Iterator[Any]:
+        start = 0 if lo is None else self.rank(lo)
+        stop = self._size if hi is None else bisect_right(self._keys, self._key(hi))
+        positions = range(start, stop)
+        for idx in reversed(positions) if reverse else positions:
+            yield self._value(idx)
+
+    def inorder(self) -> List[Any]:
+        return list(self.irange())
+
+    def min(self) -> Optional[Any]:
+        return self._value(0) if self._size else None
+
+    def max(self) -> Optional[Any]:
+        return self._value(self._size - 1) if self._size else None
+
+    def get_successor(self, val: Any) -> Any:
+        idx = self.find(val)
+        if idx is None or idx + 1 == self._size:
+            return -1
+        return self._value(idx + 1)
+
+    def _key(self, val: Any) -> Any:
+        return val.encode() if self._dtype is str else val
+
+    def _value(self, idx: int) -> Any:
+        val = self._keys[idx]
+        return val.decode() if self._dtype is str else val
@@ -0,0 +1,200 @@
+"""File-backed typed Dynamic Array in a memory mapping
+
+File layout (native byte order, recorded in the header):
+
+- header, 24 bytes: magic b"DSPYARR1", dtype (2 ascii bytes, one of
+  DTYPES keys), byte order (b"<" or b">"), 5 pad bytes, number of
+  elements (uint64)
+- elements: packed fixed-width values, the rest of the file is
+  capacity, (file size - 24) // itemsize elements
+
+Elements are read and written right in the mapping, so opening a
+file is O(1) and an array may outgrow the memory of the process.
+The number of elements in the header is updated by `flush()`,
+`close()`, every resize and, for an array dropped without `close()`,
+by its finalizer.
+"""
+
+import mmap as _mmap
+import os
+import struct
+import sys
+from typing import Optional
+
+from dspy.dyn_array import DTYPES, DynamicArray, ResizePolicy, _TypedSlots
+
+MAGIC = b"DSPYARR1"
+_HEADER = struct.Struct("=8s2sc5xQ")
+_ORDER = b"<" if sys.byteorder == "little" else b">"
+
+
+class _MappedSlots(_TypedSlots):
+    """Typed slots over a mapping, past the file header"""
+
+    __slots__ = ("base",)
+
+    def __init__(self, buf: _mmap.mmap, capacity: int, fmt: str) -> None:
+        self.owners = 0
+        self.base = memoryview(buf)
+        end = _HEADER.size + capacity * struct.calcsize(fmt)
+        self.objs = self.base[_HEADER.size : end].cast(fmt)
+
+    def release(self):
+        self.objs.release()
+        self.base.release()
+
+
+class MappedArray(DynamicArray):
+    """Typed DynamicArray persisted in a file. Capacity is
+    the file size: growing follows the ResizePolicy, extends
+    the file and maps it again, nothing is copied, so
+    `bytes_copied` stays 0.
+
+    `buffer()` views point into the mapping. While any are
+    alive the file is not shrunk by `pop`/`del` (it would
+    pull pages from under them), `shrink_to_fit()` and
+    `close()` raise BufferError then. Slices are copied into
+    a regular DynamicArray, not shared views.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        dtype: Optional[str] = None,
+        policy: Optional[ResizePolicy] = None,
+    ) -> None:
+        """
+        Args:
+            path (str): file to open, created if it doesn't exist
+            dtype (Optional[str], optional): element type, one of
+            DTYPES keys. Required for a new file, must match an
+            existing one. Defaults to None.
+            policy (Optional[ResizePolicy], optional): resize
+            policy. Defaults to None.
+
+        Raises:
+            ValueError: if dtype is unknown or doesn't match the
+            file, or file is not an array dump
+        """
+        self.policy = ResizePolicy() if policy is None else policy
+        self.resizes = 0
+        self.bytes_copied = 0
+        self._index = None
+        self._slots = None
+        if os.path.exists(path):
+            self._file = open(path, "r+b")
+            self._dtype, self._size, self._cap = self._read_header(path, dtype)
+        else:
+            if dtype not in DTYPES:
+                raise ValueError(
+                    f"Unknown dtype {dtype}, expected one of {list(DTYPES)}"
+                )
+            self._file = open(path, "w+b")
+            self._dtype, self._size, self._cap = dtype, 0, self.policy.min_capacity
+        self._set_storage(self._make_array(self._cap))
+        self._write_header()
+
+    def __enter__(self) -> "MappedArray":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __del__(self):
+        # record elements appended since the last flush(), the
+        # OS writes the mapped pages back to the file anyway
+        buf = getattr(self, "_buf", None)
+        if buf is not None and not buf.closed:
+            self._write_header()
+            self._file.close()
+        super().__del__()
+
+    def __repr__(self) -> str:
+        return f"{__class__.__name__}({self._file.name!r})"
+
+    def flush(self):
+        """Record the number of elements and write dirty
+        pages to the file
+        """
+        self._write_header()
+        self._buf.flush()
+
+    def close(self):
+        """Flush and unmap the file
+
+        Raises:
+            BufferError: if `buffer()` views are still alive,
+            the array stays open then
+        """
+        if self._buf.closed:
+            return
+        self.flush()
+        self._slots.release()
+        try:
+            self._buf.close()
+        except BufferError:
+            fmt = DTYPES[self._dtype]
+            self._set_storage(_MappedSlots(self._buf, self._cap, fmt))
+            raise
+        self._file.close()
+
+    def _slice(self, key: slice) -> DynamicArray:
+        copy = DynamicArray(dtype=self._dtype, policy=self.policy)
+        copy.extend(self[idx] for idx in range(*key.indices(self._size)))
+        return copy
+
+    def _read_header(self, path: str, dtype: Optional[str]):
+        head = self._file.read(_HEADER.size)
+        if len(head) < _HEADER.size:
+            self._file.close()
+            raise ValueError(f"{path} is not an array dump")
+        magic, kind, order, size = _HEADER.unpack(head)
+        kind = kind.decode("ascii", "replace")
+        if magic != MAGIC or kind not in DTYPES:
+            self._file.close()
+            raise ValueError(f"{path} is not an array dump")
+        if order != _ORDER:
+            self._file.close()
+            raise ValueError(f"{path} was written with other byte order")
+        if dtype is not None and dtype != kind:
+            self._file.close()
+            raise ValueError(f"{path} holds {kind} elements, not {dtype}")
+        itemsize = struct.calcsize(DTYPES[kind])
+        cap = (os.fstat(self._file.fileno()).st_size - _HEADER.size) // itemsize
+        if size > cap:
+            self._file.close()
+            raise ValueError(f"{path} is truncated")
+        return kind, size, max(cap, 1)
+
+    def _write_header(self):
+        _HEADER.pack_into(self._buf, 0, MAGIC, self._dtype.encode(), _ORDER, self._size)
+
+    def _make_array(self, capacity: int) -> _MappedSlots:
+        """Set file size to fit `capacity` elements and map it"""
+        fmt = DTYPES[self._dtype]
+        self._file.truncate(_HEADER.size + capacity * struct.calcsize(fmt))
+        self._buf = _mmap.mmap(self._file.fileno(), 0)
+        return _MappedSlots(self._buf, capacity, fmt)
+
+    def _resize(self, new_cap: int):
+        self._write_header()
+        self._slots.release()
+        try:
+            self._buf.close()
+        except BufferError:
+            if new_cap < self._cap:
+                # exported views still use the tail pages
+                fmt = DTYPES[self._dtype]
+                self._set_storage(_MappedSlots(self._buf, self._cap, fmt))
+                raise
+            # growing keeps the old pages, the old mapping lives
+            # on until its last view is gone
+        self._set_storage(self._make_array(new_cap))
+        self._cap = new_cap
+        self.resizes += 1
+
+    def _maybe_shrink(self):
+        try:
+            super()._maybe_shrink()
+        except BufferError:
+            pass  # shrink later, when views are released
@@ -0,0 +1,147 @@
+"""Persistent (path-copying) AVL Tree"""
+
+import copy
+from typing import Any, Dict, Iterable, List
+
+from dspy.bstree import AVLNode, AVLTree, _node_height, _update_size
+
+
+class PersistentBSTree(AVLTree):
+    """AVL Tree which never modifies a node reachable from
+    the root. Every insert/delete copies only the O(height)
+    nodes on the changed path (plus a few rotated ones) and
+    publishes a new root with a single assignment, the rest
+    of the structure is shared with previous versions.
+
+    `snapshot()` is O(1): it grabs the current root, readers
+    may traverse it without locks while a writer keeps
+    mutating the tree. Writers still have to be serialised.
+    """
+
+    def snapshot(self) -> "PersistentBSTree":
+        """Immutable (as long as nobody mutates it) version
+        of the tree, sharing all nodes with it. O(1)
+
+        Returns:
+            PersistentBSTree: tree with the current root
+        """
+        snap = copy.copy(self)
+        # one read of root, size is taken from the root itself,
+        # so concurrent writer can't make them inconsistent
+        root = self.root
+        snap.root = root
+        snap._size = 0 if root is None else root.size
+        return snap
+
+    def _load_sorted(self, values: List[Any]):
+        # the new version is built aside, readers never see
+        # an empty tree in between
+        if values:
+            self._dtype = values[0]
+        self.root = self._build_sorted(values)  # publish new version
+        self._size = len(values)
+
+    def _insert(self, val: Any) -> AVLNode:
+        path = []
+        node = self.root
+        while node is not None:
+            path.append(node)
+            node = node.left if val < node.val else node.right
+        new = child = self._new_node(val)
+        for node in reversed(path):
+            node = _copy(node)
+            if val < node.val:
+                node.left = child
+            else:
+                node.right = child
+            _update_size(node)
+            child = self._balance(node)
+        self.root = child  # publish new version
+        return new
+
+    def _delete(self, val: Any):
+        path = []
+        node = self.root
+        while node.val != val:
+            path.append(node)
+            node = node.left if val < node.val else node.right
+        holder = suc_val = None
+        if node.left is not None and node.right is not None:
+            # successor value goes to holder copy,
+            # successor node is unlinked instead
+            holder = node
+            path.append(node)
+            suc = node.right
+            while suc.left is not None:
+                path.append(suc)
+                suc = suc.left
+            node, suc_val = suc, suc.val
+        old, child = node, node.left if node.left is not None else node.right
+        for node in reversed(path):
+            new = _copy(node)
+            if node is holder:
+                new.val = suc_val
+            if node.left is old:
+                new.left = child
+            else:
+                new.right = child
+            _update_size(new)
+            old, child = node, self._balance(new)
+        self.root = child  # publish new version
+
+    def _balance(self, node: AVLNode) -> AVLNode:
+        """`node` is a fresh copy, but rotations also relink
+        its heavy child (and inner grandchild), copy them first,
+        older versions keep pointing at the originals
+        """
+        balance = _node_height(node.left) - _node_height(node.right)
+        if balance > 1:
+            node.left = heavy = _copy(node.left)
+            if heavy.right is not None:
+                heavy.right = _copy(heavy.right)
+        elif balance < -1:
+            node.right = heavy = _copy(node.right)
+            if heavy.left is not None:
+                heavy.left = _copy(heavy.left)
+        return super()._balance(node)
+
+
+def sharing_stats(trees: Iterable[PersistentBSTree]) -> Dict[str, float]:
+    """How much structure versions of a tree share.
+    Subtree of an already seen node is shared as a whole
+    (nodes are immutable), so it is not walked again, cost
+    is O(number of distinct nodes)
+
+    Args:
+        trees (Iterable[PersistentBSTree]): versions (snapshots)
+
+    Returns:
+        Dict[str, float]: number of versions, logical nodes
+        (sum of versions sizes), physical (distinct) nodes and
+        sharing ratio (1 - physical / logical)
+    """
+    seen = set()
+    versions = logical = 0
+    for tree in trees:
+        versions += 1
+        stack = [] if tree.root is None else [tree.root]
+        logical += 0 if tree.root is None else tree.root.size
+        while stack:
+            node = stack.pop()
+            if id(node) in seen:
+                continue
+            seen.add(id(node))
+            stack.extend(ch for ch in (node.left, node.right) if ch is not None)
+    physical = len(seen)
+    return {
+        "versions": versions,
+        "logical_nodes": logical,
+        "physical_nodes": physical,
+        "sharing": 1 - physical / logical if logical else 0.0,
+    }
+
+
+def _copy(node: AVLNode) -> AVLNode:
+    new = AVLNode(val=node.val, left=node.left, right=node.right)
+    new.height = node.height
+    return new
@@ -0,0 +1,137 @@
+"""Static (read-only) search index in Eytzinger layout"""
+
+from array import array
+from typing import Any, Iterable, List, Sequence, Union
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional
+    np = None
+
+
+class StaticIndex:
+    """Frozen sorted set of values for read-mostly workloads.
+
+    Values are stored in a flat list in Eytzinger (BFS) order:
+    node `k` has children `2k` and `2k + 1`, so a search walks
+    a contiguous array with no TreeNode pointer chasing, and
+    the top levels of every search share the same few slots.
+
+    If NumPy is installed and values are numeric, batch
+    queries (`contains_many`, `rank_many`) are answered by
+    vectorised binary search over a sorted NumPy array and
+    return NumPy arrays, otherwise they return lists.
+    """
+
+    def __init__(self, values: Iterable[Any]) -> None:
+        """
+        Args:
+            values (Iterable[Any]): sorted unique values
+        """
+        values = list(values)
+        self._size = len(values)
+        self._layout, self._ranks = _eytzinger(values)
+        self._sorted = None
+        if np is not None and values:
+            arr = np.asarray(values)
+            if arr.dtype.kind in "iuf":
+                self._sorted = arr
+
+    @classmethod
+    def from_tree(cls, tree) -> "StaticIndex":
+        """Freeze any BSTree variant, O(n)
+
+        Args:
+            tree (BSTree): tree to take values from
+
+        Returns:
+            StaticIndex: index with tree values
+        """
+        return cls(tree.irange())
+
+    @property
+    def vectorised(self) -> bool:
+        return self._sorted is not None
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, key: Any) -> bool:
+        k = self._lower_bound(key)
+        return k != 0 and self._layout[k] == key
+
+    def rank(self, key: Any) -> int:
+        """Number of values strictly less than `key`"""
+        k = self._lower_bound(key)
+        return self._size if k == 0 else self._ranks[k]
+
+    def contains_many(self, keys: Iterable[Any]) -> Union[List[bool], Any]:
+        """Membership for a batch of keys
+
+        Args:
+            keys (Iterable[Any]): keys to look up
+
+        Returns:
+            Union[List[bool], np.ndarray]: True for keys in index
+        """
+        if self._sorted is not None:
+            keys = np.asarray(keys)
+            pos = np.searchsorted(self._sorted, keys, side="left")
+            found = pos < self._size
+            found[found] = self._sorted[pos[found]] == keys[found]
+            return found
+        return [key in self for key in keys]
+
+    def rank_many(self, keys: Iterable[Any]) -> Union[List[int], Any]:
+        """Rank (number of smaller values) for a batch of keys
+
+        Args:
+            keys (Iterable[Any]): keys to rank
+
+        Returns:
+            Union[List[int], np.ndarray]: ranks
+        """
+        if self._sorted is not None:
+            return np.searchsorted(self._sorted, np.asarray(keys), side="left")
+        return [self.rank(key) for key in keys]
+
+    def _lower_bound(self, key: Any) -> int:
+        """Eytzinger slot of the smallest value >= `key`,
+        0 if all values are smaller
+        """
+        layout, n = self._layout, self._size
+        k = 1
+        while k <= n:
+            k = 2 * k + (layout[k] < key)
+        # we went right (1 bits) past the answer, then once left (0 bit),
+        # drop trailing ones and that zero to get back to it
+        return k >> ((~k) & (k + 1)).bit_length()
+
+
+def _eytzinger(values: Sequence[Any]):
+    """Place sorted `values` into 1-based BFS order of an
+    implicit complete tree (inorder walk over slots)
+
+    Args:
+        values (Sequence[Any]): sorted unique values
+
+    Returns:
+        layout list (slot 0 unused) and sorted position of
+        every slot
+    """
+    n = len(values)
+    layout = [None] * (n + 1)
+    ranks = array("q", bytes(8 * (n + 1)))
+    i = 0
+    stack = []
+    k = 1
+    while stack or k <= n:
+        while k <= n:
+            stack.append(k)
+            k = 2 * k
+        k = stack.pop()
+        layout[k] = values[i]
+        ranks[k] = i
+        i += 1
+        k = 2 * k + 1
+    return layout, ranks
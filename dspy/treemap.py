@@ -0,0 +1,318 @@
+"""Sorted Map (key -> value) on top of AVL Tree"""
+
+from operator import itemgetter
+from typing import Any, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
+
+from dspy.bstree import AVLNode, AVLTree, BSTree
+
+Entry = Tuple[Any, Any]
+
+
+class MapNode(AVLNode):
+    """AVL node, `val` is a key, `value` is a mapped value"""
+
+    __slots__ = ("value",)
+
+    def __init__(self, val=0, left=None, right=None, value=None):
+        super().__init__(val=val, left=left, right=right)
+        self.value = value
+
+
+class TreeMap(AVLTree):
+    """Sorted key -> value map. Keys are kept in AVL tree,
+    so every operation is O(log n). Neighbour queries
+    (floor, ceiling, lower, higher, predecessor, successor)
+    are done in a single root-to-leaf pass and return
+    (key, value) entry or None if there is no such entry.
+    Set algebra of trees (union, update, ...) goes by keys
+    and carries values, for a key in both maps the value of
+    the other map wins, as in dict.update.
+    """
+
+    def __init__(
+        self,
+        items: Optional[Union[Mapping, Iterable[Entry]]] = None,
+        dtype: Optional[type] = None,
+        trusted: bool = False,
+    ) -> None:
+        """
+        Args:
+            items (Optional[Union[Mapping, Iterable[Entry]]], optional):
+            mapping or (key, value) entries to insert. Defaults to None.
+            dtype (Optional[type], optional): keys type, if not given
+            it is taken from the first inserted key. Defaults to None.
+            trusted (bool, optional): caller guarantees keys are of
+            `dtype`, per-call type checks are skipped. Defaults to False.
+        """
+        super().__init__(dtype=dtype, trusted=trusted)
+        if items:
+            self.update(items)
+
+    def update(self, items: Union["TreeMap", Mapping, Iterable[Entry]]):
+        """Insert or update entries, as dict.update. Another
+        TreeMap is merged like trees are (see BSTree.update),
+        a mapping or (key, value) entries are set one by one
+
+        Raises:
+            AttributeError: if key type mismatch
+        """
+        if isinstance(items, BSTree):  # TypeError for non-map trees
+            super().update(items)
+            return
+        if isinstance(items, Mapping):
+            items = items.items()
+        for key, value in items:
+            self[key] = value
+
+    @classmethod
+    def bulk_load(cls, items: Union[Mapping, Iterable[Entry]]) -> "TreeMap":
+        """Build a perfectly balanced map from `items` at once.
+        Entries are sorted by key (skipped if already sorted),
+        for a duplicate key the last value wins, as in dict.
+        Entries with a key type different from the first one
+        are dropped.
+
+        Args:
+            items (Union[Mapping, Iterable[Entry]]): mapping or
+            (key, value) entries to load
+
+        Returns:
+            TreeMap: new balanced map
+        """
+        tree = cls()
+        if isinstance(items, Mapping):
+            items = items.items()
+        entries = list(items)
+        if not entries:
+            return tree
+        tree._dtype = entries[0][0]
+        dtype = tree._dtype
+        entries = [entry for entry in entries if isinstance(entry[0], dtype)]
+        if any(not a[0] < b[0] for a, b in zip(entries, entries[1:])):
+            entries.sort(key=itemgetter(0))  # stable, last duplicate stays last
+            last = len(entries) - 1
+            entries = [
+                entry
+                for i, entry in enumerate(entries)
+                if i == last or entries[i + 1][0] != entry[0]
+            ]
+        tree._load_sorted(entries)
+        return tree
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True):
+        """Tree dumps keep keys only, a map can't be loaded
+
+        Raises:
+            TypeError: always
+        """
+        raise TypeError("TreeMap can't be loaded from a keys-only dump")
+
+    def dump(self, path: str):
+        """Tree dumps keep keys only, values would be lost
+
+        Raises:
+            TypeError: always
+        """
+        raise TypeError("TreeMap values can't be dumped")
+
+    def insert(self, val: Any) -> bool:
+        """A key can't be inserted without a value,
+        use `map[key] = value`
+
+        Raises:
+            TypeError: always
+        """
+        raise TypeError("use map[key] = value to insert into TreeMap")
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, key: Any) -> Any:
+        node = self.find(key)
+        if node is None:
+            raise KeyError(key)
+        return node.value
+
+    def __setitem__(self, key: Any, value: Any):
+        """Insert or update `key` mapping. Keys must be
+        of the same type as the first key
+
+        Raises:
+            AttributeError: if key type mismatch or key
+            is not comparable
+        """
+        self._dtype = key
+        if not self._trusted:
+            self._check_dtype_mismatch(key)
+        node = self._search(key)
+        if node is None:
+            node = self._insert(key)
+            self._size += 1
+        node.value = value
+
+    def __delitem__(self, key: Any):
+        if not self.del_value(key):
+            raise KeyError(key)
+
+    def __iter__(self) -> Iterator[Any]:
+        return self.irange()
+
+    def __repr__(self) -> str:
+        return f"{__class__.__name__}({dict(self.items())})"
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        node = self.find(key)
+        return default if node is None else node.value
+
+    def keys(self) -> Iterator[Any]:
+        return self.irange()
+
+    def values(self) -> Iterator[Any]:
+        return (value for _, value in self.items())
+
+    def items(self) -> Iterator[Entry]:
+        stack = []
+        node = self.root
+        while stack or node:
+            while node:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.val, node.value
+            node = node.right
+
+    def floor(self, key: Any) -> Optional[Entry]:
+        """Entry with the greatest key <= `key`"""
+        return self._closest(key, below=True, inclusive=True)
+
+    def ceiling(self, key: Any) -> Optional[Entry]:
+        """Entry with the smallest key >= `key`"""
+        return self._closest(key, below=False, inclusive=True)
+
+    def lower(self, key: Any) -> Optional[Entry]:
+        """Entry with the greatest key < `key`"""
+        return self._closest(key, below=True, inclusive=False)
+
+    def higher(self, key: Any) -> Optional[Entry]:
+        """Entry with the smallest key > `key`"""
+        return self._closest(key, below=False, inclusive=False)
+
+    def predecessor(self, key: Any) -> Optional[Entry]:
+        """Entry before `key` in key order, `key` must
+        be in the map
+
+        Raises:
+            KeyError: if `key` is not in the map
+        """
+        return self._neighbour(key, below=True)
+
+    def successor(self, key: Any) -> Optional[Entry]:
+        """Entry after `key` in key order, `key` must
+        be in the map
+
+        Raises:
+            KeyError: if `key` is not in the map
+        """
+        return self._neighbour(key, below=False)
+
+    def pop_min(self) -> Entry:
+        """Remove and return entry with the smallest key
+
+        Raises:
+            KeyError: if map is empty
+        """
+        return self._pop_edge(first=True)
+
+    def pop_max(self) -> Entry:
+        """Remove and return entry with the greatest key
+
+        Raises:
+            KeyError: if map is empty
+        """
+        return self._pop_edge(first=False)
+
+    def _new_node(self, val: Any) -> MapNode:
+        return MapNode(val=val)
+
+    def _move_val(self, dst: MapNode, src: MapNode):
+        dst.val, dst.value = src.val, src.value
+
+    def _items(self) -> Iterator[Entry]:
+        return self.items()
+
+    _item_key = staticmethod(itemgetter(0))
+
+    def _insert_item(self, entry: Entry):
+        key, value = entry
+        self[key] = value
+
+    def _load_sorted(self, entries: List[Entry]):
+        # bulk building goes over (key, value) entries
+        if entries:
+            self._dtype = entries[0][0]
+        super()._load_sorted(entries)
+
+    def _join(
+        self, left: Optional[MapNode], entry: Entry, right: Optional[MapNode]
+    ) -> MapNode:
+        key, value = entry
+        node = super()._join(left, key, right)
+        node.value = value
+        return node
+
+    def _closest(self, key: Any, below: bool, inclusive: bool) -> Optional[Entry]:
+        """Single descent to the closest key below (or above) `key`
+
+        Args:
+            key (Any): key to look around
+            below (bool): look for keys below `key` if True,
+            above otherwise
+            inclusive (bool): `key` itself is a valid answer
+
+        Returns:
+            Optional[Entry]: closest entry or None
+        """
+        best = None
+        node = self.root
+        while node is not None:
+            if node.val == key:
+                if inclusive:
+                    return node.val, node.value
+                # strict: best one is the edge of a child subtree
+                node = node.left if below else node.right
+            elif (node.val < key) == below:
+                best = node  # candidate, look for a closer one
+                node = node.right if below else node.left
+            else:
+                node = node.left if below else node.right
+        return None if best is None else (best.val, best.value)
+
+    def _neighbour(self, key: Any, below: bool) -> Optional[Entry]:
+        best = None
+        node = self.root
+        while node is not None and node.val != key:
+            if (node.val < key) == below:
+                best = node
+                node = node.right if below else node.left
+            else:
+                node = node.left if below else node.right
+        if node is None:
+            raise KeyError(key)
+        # continue down: the edge of a child subtree is closer
+        child = node.left if below else node.right
+        while child is not None:
+            best = child
+            child = child.right if below else child.left
+        return None if best is None else (best.val, best.value)
+
+    def _pop_edge(self, first: bool) -> Entry:
+        if self.root is None:
+            raise KeyError("pop from an empty map")
+        node = self.root
+        while (node.left if first else node.right) is not None:
+            node = node.left if first else node.right
+        entry = node.val, node.value
+        self._delete(node.val)
+        self._size -= 1
+        return entry
@@ -1,12 +1,20 @@
+import random
+
 import pytest
 
 from dspy.bstree import (
+    AVLTree,
     BSTree,
     TreeNode,
     _first,
     _is_leaf,
     _last,
     find_by_value,
+    iter_inorder,
+    iter_level_order,
+    iter_levels,
+    iter_postorder,
+    iter_preorder,
     level_traverse,
 )
 
@@ -156,6 +164,15 @@ def test_find_by_value():
     assert node is not None and node == tree.root.left
 
 
+def test_find_by_value_deep_spine():
+    root = node = TreeNode(0)
+    for i in range(1, 5000):
+        node.right = TreeNode(i)
+        node = node.right
+    assert find_by_value(root, 4999) is node
+    assert find_by_value(root, -1) is None
+
+
 def test_inorder():
     values = [4, 3, 9, 1, 12, 2, 0]
     tree = BSTree(values)
@@ -298,3 +315,363 @@ def test_get_successor_right_path():
 def test_get_successor_left_path():
     tree = BSTree(values=[5, 1, 2, 3, 10, 8])
     assert tree.get_successor(3) == 5
+
+
+def _is_avl(node) -> bool:
+    if node is None:
+        return True
+    left = node.left.height if node.left else -1
+    right = node.right.height if node.right else -1
+    ok = abs(left - right) <= 1 and node.height == max(left, right) + 1
+    return ok and _is_avl(node.left) and _is_avl(node.right)
+
+
+def test_avl_sorted_insert_height():
+    n = 1023
+    tree = AVLTree(values=list(range(n)))
+    assert tree.height() == 9
+    assert tree.get_node_count() == n
+    assert tree.inorder() == list(range(n))
+    assert _is_avl(tree.root) and tree.is_bstree()
+
+
+def test_avl_insert_rotations():
+    # left-right and right-left cases
+    tree = AVLTree(values=[30, 10, 20])
+    assert tree.root.val == 20
+    tree = AVLTree(values=[10, 30, 20])
+    assert tree.root.val == 20
+
+
+def test_avl_insert_duplicate_mismatch():
+    tree = AVLTree(values=[2, 1, 3])
+    assert not tree.insert(2)
+    assert not tree.insert("a")
+
+
+def test_avl_del_value():
+    values = random.sample(range(10_000), k=1000)
+    tree = AVLTree(values=values)
+    for v in values[:700]:
+        assert tree.del_value(v)
+        assert _is_avl(tree.root)
+    assert not tree.del_value(values[0])
+    assert tree.inorder() == sorted(values[700:])
+    assert tree.get_node_count() == 300
+
+
+def test_avl_successor_min_max():
+    tree = AVLTree(values=list(range(100)))
+    assert tree.min() == 0 and tree.max() == 99
+    assert tree.get_successor(41) == 42
+
+
+@pytest.fixture(scope="module")
+def deep():
+    # degenerated tree (right spine) much deeper than recursion limit
+    n = 50_000
+    tree = BSTree()
+    tree.root = node = TreeNode(0)
+    for v in range(1, n):
+        node.right = TreeNode(v)
+        node = node.right
+    tree._size = n
+    return tree
+
+
+def test_deep_tree_no_recursion(deep):
+    n = deep.get_node_count()
+    assert deep.height() == n - 1
+    assert deep.find(n - 1).val == n - 1
+    assert deep.max() == n - 1 and deep.min() == 0
+    assert deep.inorder() == list(range(n))
+    assert deep.is_bstree()
+    assert deep.get_successor(n - 2) == n - 1
+
+
+def test_deep_tree_insert_delete():
+    n = 3000
+    tree = BSTree(values=list(range(n, 0, -1)))
+    assert tree.height() == n - 1
+    assert tree.insert(0) and tree.min() == 0
+    assert tree.del_value(1) and tree.del_value(n)
+    assert tree.inorder() == [0] + list(range(2, n))
+
+
+def test_bulk_load_empty():
+    tree = BSTree.bulk_load([])
+    assert tree.root is None and tree.get_node_count() == 0
+
+
+def test_bulk_load_sorted():
+    n = 1000
+    tree = BSTree.bulk_load(range(n))
+    assert tree.get_node_count() == n
+    assert tree.height() == 9
+    assert tree.inorder() == list(range(n))
+    assert tree._dtype is int
+
+
+def test_bulk_load_unsorted_duplicates_mismatch():
+    values = [5, 3, 9, 3, "a", 1, 5, 7]
+    tree = BSTree.bulk_load(values)
+    assert tree.inorder() == [1, 3, 5, 7, 9]
+    assert tree.get_node_count() == 5
+    assert tree.is_bstree()
+    assert tree.insert(4) and not tree.insert("b")
+
+
+def test_bulk_load_avl():
+    values = random.sample(range(10_000), k=777)
+    tree = AVLTree.bulk_load(values)
+    assert isinstance(tree, AVLTree)
+    assert _is_avl(tree.root)
+    assert tree.inorder() == sorted(values)
+    for v in values[:300]:
+        assert tree.del_value(v)
+    assert _is_avl(tree.root)
+
+
+def _sizes_ok(node) -> bool:
+    if node is None:
+        return True
+    left = node.left.size if node.left else 0
+    right = node.right.size if node.right else 0
+    ok = node.size == left + right + 1
+    return ok and _sizes_ok(node.left) and _sizes_ok(node.right)
+
+
+def test_tree_node_size():
+    node = TreeNode(val=2, left=TreeNode(1), right=TreeNode(3, right=TreeNode(4)))
+    assert node.size == 4
+
+
+@pytest.mark.parametrize("cls", [BSTree, AVLTree])
+def test_sizes_maintained(cls):
+    values = random.sample(range(1000), k=300)
+    tree = cls(values=values)
+    assert _sizes_ok(tree.root) and tree.root.size == 300
+    for v in values[:150]:
+        tree.del_value(v)
+    tree.insert(values[0])
+    assert _sizes_ok(tree.root) and tree.root.size == 151
+
+
+@pytest.mark.parametrize("cls", [BSTree, AVLTree])
+def test_rank_select(cls):
+    values = random.sample(range(1000), k=200)
+    tree = cls(values=values)
+    ordered = sorted(values)
+    for k, v in enumerate(ordered):
+        assert tree.select(k) == v
+        assert tree.rank(v) == k
+    assert tree.select(-1) == ordered[-1]
+    assert tree.rank(-5) == 0 and tree.rank(10_000) == 200
+
+
+def test_select_out_of_range():
+    tree = BSTree(values=[1, 2, 3])
+    with pytest.raises(IndexError, match="out of range"):
+        tree.select(3)
+    with pytest.raises(IndexError, match="out of range"):
+        BSTree().select(0)
+
+
+def test_count_range():
+    tree = AVLTree.bulk_load(range(0, 100, 2))
+    assert tree.count_range(10, 20) == 6
+    assert tree.count_range(11, 19) == 4
+    assert tree.count_range(-10, 1000) == 50
+    assert tree.count_range(20, 10) == 0
+    assert BSTree().count_range(0, 10) == 0
+
+
+def test_irange_empty():
+    assert list(BSTree().irange(0, 10)) == []
+
+
+@pytest.mark.parametrize("cls", [BSTree, AVLTree])
+def test_irange(cls):
+    values = random.sample(range(1000), k=300)
+    tree = cls(values=values)
+    ordered = sorted(values)
+    assert list(tree.irange()) == ordered
+    assert list(tree.irange(reverse=True)) == ordered[::-1]
+    for lo, hi in [(100, 200), (-5, 50), (900, 2000), (500, 500), (300, 10)]:
+        want = [v for v in ordered if lo <= v <= hi]
+        assert list(tree.irange(lo, hi)) == want
+        assert list(tree.irange(lo, hi, reverse=True)) == want[::-1]
+    assert list(tree.irange(lo=990)) == [v for v in ordered if v >= 990]
+    want = [v for v in ordered if v <= 10][::-1]
+    assert list(tree.irange(hi=10, reverse=True)) == want
+
+
+def test_irange_lazy(deep):
+    # first values of a very deep tree without walking it all
+    it = deep.irange(lo=10)
+    assert [next(it) for _ in range(3)] == [10, 11, 12]
+
+
+@pytest.fixture
+def two_sets():
+    a = set(random.sample(range(2000), k=500))
+    b = set(random.sample(range(2000), k=400))
+    return a, b
+
+
+@pytest.mark.parametrize("cls", [BSTree, AVLTree])
+def test_set_algebra(cls, two_sets):
+    a, b = two_sets
+    ta, tb = cls(values=list(a)), cls(values=list(b))
+    for method, want in [
+        ("union", a | b),
+        ("intersection", a & b),
+        ("difference", a - b),
+        ("symmetric_difference", a ^ b),
+    ]:
+        got = getattr(ta, method)(tb)
+        assert isinstance(got, cls)
+        assert got.inorder() == sorted(want)
+        assert got.get_node_count() == len(want)
+        assert got.height() <= len(want).bit_length()
+    # operands untouched
+    assert ta.inorder() == sorted(a) and tb.inorder() == sorted(b)
+
+
+@pytest.mark.parametrize("small", [False, True])
+@pytest.mark.parametrize(
+    "method, op",
+    [
+        ("update", set.__or__),
+        ("intersection_update", set.__and__),
+        ("difference_update", set.__sub__),
+        ("symmetric_difference_update", set.__xor__),
+    ],
+)
+def test_set_algebra_in_place(two_sets, method, op, small):
+    a, b = two_sets
+    if small:  # applied value by value
+        b = set(list(b)[:5])
+    ta, tb = AVLTree(values=list(a)), AVLTree(values=list(b))
+    getattr(ta, method)(tb)
+    want = op(a, b)
+    assert ta.inorder() == sorted(want)
+    assert ta.get_node_count() == len(want)
+    assert tb.inorder() == sorted(b)
+    assert _is_avl(ta.root) and _sizes_ok(ta.root)
+
+
+def test_set_algebra_empty():
+    tree = BSTree(values=[1, 2])
+    assert tree.union(BSTree()).inorder() == [1, 2]
+    assert BSTree().union(tree).inorder() == [1, 2]
+    assert tree.intersection(BSTree()).root is None
+
+
+def test_set_algebra_mismatch():
+    with pytest.raises(AttributeError, match="mismatch"):
+        BSTree(values=[1]).union(BSTree(values=["a"]))
+
+
+@pytest.mark.parametrize("size", [1, 100])  # value by value, rebuilt
+@pytest.mark.parametrize(
+    "method", ["update", "difference_update", "symmetric_difference_update"]
+)
+def test_set_algebra_in_place_mismatch(method, size):
+    tree = BSTree(values=list(range(100)))
+    with pytest.raises(AttributeError, match="mismatch"):
+        getattr(tree, method)(BSTree(values=[str(i) for i in range(size)]))
+    assert tree.inorder() == list(range(100))
+
+
+def test_find_incompatible_no_print(capsys):
+    tree = BSTree(values=[1, 2, 3])
+    assert tree.find("abc") is None
+    assert not capsys.readouterr().out
+    assert tree.type_mismatches == 1
+
+
+def test_type_mismatches_counted():
+    tree = BSTree(values=[1, 2, "a", 3])
+    assert tree.type_mismatches == 1
+    assert not tree.del_value("b")
+    assert "c" not in tree
+    assert tree.type_mismatches == 3
+
+
+def test_declared_dtype():
+    tree = BSTree(dtype=float)
+    assert tree._dtype is float
+    assert not tree.insert(1)
+    assert tree.insert(1.5) and tree.type_mismatches == 1
+
+
+def test_declared_dtype_not_comparable():
+    class Dummy:
+        pass
+
+    with pytest.raises(AttributeError, match="comparable"):
+        BSTree(dtype=Dummy)
+    tree = BSTree(dtype=dict)
+    with pytest.raises(AttributeError, match="comparable"):
+        tree.insert({1: 1})
+    assert tree.root is None
+
+
+def test_trusted():
+    tree = AVLTree(values=[3, 1, 2], dtype=int, trusted=True)
+    assert tree.inorder() == [1, 2, 3]
+    assert tree.find(2).val == 2 and tree.del_value(2)
+    assert tree.type_mismatches == 0
+    # no checks, comparison itself fails
+    with pytest.raises(TypeError):
+        tree.insert("a")
+
+
+@pytest.fixture
+def small_tree():
+    #        4
+    #      2   6
+    #     1 3 5 7
+    return BSTree(values=[4, 2, 6, 1, 3, 5, 7])
+
+
+def test_iter_orders(small_tree):
+    root = small_tree.root
+    assert list(iter_preorder(root)) == [4, 2, 1, 3, 6, 5, 7]
+    assert list(iter_inorder(root)) == [1, 2, 3, 4, 5, 6, 7]
+    assert list(iter_postorder(root)) == [1, 3, 2, 5, 7, 6, 4]
+    assert list(iter_level_order(root)) == [4, 2, 6, 1, 3, 5, 7]
+    assert list(iter_levels(root)) == [[4], [2, 6], [1, 3, 5, 7]]
+
+
+def test_iter_nodes(small_tree):
+    nodes = list(iter_postorder(small_tree.root, nodes=True))
+    assert nodes[-1] is small_tree.root
+    assert iter_levels(small_tree.root, nodes=True).__next__() == [small_tree.root]
+
+
+@pytest.mark.parametrize(
+    "fn", [iter_preorder, iter_inorder, iter_postorder, iter_level_order, iter_levels]
+)
+def test_iter_empty(fn):
+    assert list(fn(None)) == []
+
+
+def test_iter_deep(deep):
+    n = deep.get_node_count()
+    assert list(iter_preorder(deep.root)) == list(range(n))
+    assert list(iter_postorder(deep.root)) == list(range(n - 1, -1, -1))
+    assert sum(1 for _ in iter_levels(deep.root)) == n
+
+
+def test_iter_random_postorder():
+    values = random.sample(range(1000), k=200)
+    tree = BSTree(values=values)
+
+    def post(node):
+        if node is None:
+            return []
+        return post(node.left) + post(node.right) + [node.val]
+
+    assert list(iter_postorder(tree.root)) == post(tree.root)
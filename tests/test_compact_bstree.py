@@ -0,0 +1,91 @@
+import random
+
+import pytest
+
+from dspy.compact_bstree import CompactBSTree
+
+
+def test_empty():
+    tree = CompactBSTree()
+    assert tree.root is None and tree.get_node_count() == 0
+    assert tree.find(1) is None and 1 not in tree
+    assert tree.min() is None and tree.max() is None
+    assert tree.inorder() == [] and tree.height() == 0
+
+
+def test_insert():
+    tree = CompactBSTree(values=[5, 2, 8, 1])
+    assert tree.value(tree.root) == 5
+    assert tree.value(tree._left[tree.root]) == 2
+    assert not tree.insert(5) and not tree.insert("a")
+    assert tree.get_node_count() == 4
+    assert tree.inorder() == [1, 2, 5, 8]
+    assert tree.is_bstree()
+
+
+def test_del_value():
+    values = random.sample(range(1000), k=300)
+    tree = CompactBSTree(values=values)
+    for v in values[:200]:
+        assert tree.del_value(v)
+    assert not tree.del_value(values[0])
+    assert tree.inorder() == sorted(values[200:])
+    assert tree.get_node_count() == 100 and tree.is_bstree()
+
+
+def test_del_root_to_empty():
+    tree = CompactBSTree(values=[1])
+    assert tree.del_value(1)
+    assert tree.root is None and tree.inorder() == []
+
+
+def test_free_list_reuse():
+    tree = CompactBSTree(values=[4, 2, 6, 1, 3])
+    slots = len(tree._vals)
+    tree.del_value(2)
+    tree.del_value(6)
+    tree.insert(10)
+    tree.insert(0)
+    assert len(tree._vals) == slots
+    assert tree.inorder() == [0, 1, 3, 4, 10]
+
+
+def test_queries():
+    values = random.sample(range(1000), k=200)
+    tree = CompactBSTree(values=values)
+    ordered = sorted(values)
+    assert tree.min() == ordered[0] and tree.max() == ordered[-1]
+    assert tree.value(tree.find(ordered[10])) == ordered[10]
+    assert tree.get_successor(ordered[10]) == ordered[11]
+    assert tree.get_successor(ordered[-1]) == -1
+    assert tree.select(17) == ordered[17] and tree.rank(ordered[17]) == 17
+    assert tree.count_range(100, 500) == len([v for v in ordered if 100 <= v <= 500])
+    want = [v for v in ordered if 250 <= v <= 750]
+    assert list(tree.irange(250, 750)) == want
+    assert list(tree.irange(250, 750, reverse=True)) == want[::-1]
+
+
+def test_bulk_load():
+    tree = CompactBSTree.bulk_load([3, 1, 2, 2, 9, 7])
+    assert isinstance(tree, CompactBSTree)
+    assert tree.inorder() == [1, 2, 3, 7, 9]
+    assert tree.height() == 2 and tree.is_bstree()
+    assert tree.select(4) == 9
+    with pytest.raises(IndexError):
+        tree.select(5)
+
+
+def test_delete():
+    tree = CompactBSTree(values=[3, 1, 2])
+    tree.delete()
+    assert tree.root is None and tree.get_node_count() == 0
+    assert tree.insert(1) and tree.inorder() == [1]
+
+
+def test_set_algebra():
+    a = CompactBSTree(values=[5, 1, 9, 3])
+    b = CompactBSTree(values=[3, 4, 5])
+    assert a.union(b).inorder() == [1, 3, 4, 5, 9]
+    assert a.symmetric_difference(b).inorder() == [1, 4, 9]
+    a.intersection_update(b)
+    assert a.inorder() == [3, 5] and len(a._vals) == 2
@@ -0,0 +1,57 @@
+import random
+
+import pytest
+
+from dspy.compact_hashmap import CompactHashMap
+from dspy.hashmap import PROBING, MyHashMap
+
+
+@pytest.mark.parametrize("probing", PROBING)
+def test_matches_item_layout(probing):
+    rnd = random.Random(17)
+    compact = CompactHashMap(capacity=4, probing=probing)
+    items = MyHashMap(capacity=4, probing=probing)
+    for _ in range(5000):
+        key = rnd.choice([rnd.randint(0, 300), rnd.randint(-(2 ** 63), 2 ** 63 - 1)])
+        if rnd.random() < 0.6:
+            value = rnd.randint(-(2 ** 63), 2 ** 63 - 1)
+            compact.put(key, value)
+            items.put(key, value)
+        else:
+            compact.remove(key)
+            items.remove(key)
+    assert len(compact) == len(items)
+    assert compact._cap == items._cap and compact._deleted == items._deleted
+    assert compact.probe_stats() == items.probe_stats()
+    assert all(compact.get(key) == items.get(key) for key in items._stored_keys())
+
+
+def test_table_is_flat():
+    hm = CompactHashMap(capacity=16)
+    for key in range(5):
+        hm.put(key, key * 2)
+    hm.remove(3)
+    keys, values, states = hm._table
+    assert keys.typecode == values.typecode == "q" and isinstance(states, bytearray)
+    assert list(states[:5]) == [1, 1, 1, 2, 1]
+    assert hm.get(4) == 8 and hm.get(3) == -1
+
+
+def test_out_of_range_key_keeps_map():
+    hm = CompactHashMap()
+    hm.put(1, 1)
+    with pytest.raises(OverflowError):
+        hm.put(2 ** 64, 1)
+    with pytest.raises(OverflowError):
+        hm.put(2, 2 ** 64)
+    assert len(hm) == 1 and hm.get(2) == -1 and hm.get(1) == 1
+
+
+def test_tombstones_compacted():
+    hm = CompactHashMap(capacity=64, tombstone_ratio=0.25)
+    for key in range(30):
+        hm.put(key, key)
+    for key in range(17):
+        hm.remove(key)
+    assert hm._deleted == 0 and 2 not in hm._table[2]
+    assert [hm.get(key) for key in range(15, 19)] == [-1, -1, 17, 18]
@@ -0,0 +1,111 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from dspy.bstree import BSTree
+from dspy.concurrent_bstree import ConcurrentBSTree, RWLock
+
+
+def test_api():
+    tree = ConcurrentBSTree()
+    assert tree.insert(5) and not tree.insert(5)
+    assert tree.insert_many([1, 9, 3, 7, 1]) == 4
+    assert len(tree) == 5 and tree.get_node_count() == 5
+    assert 3 in tree and tree.find(3) == 3 and tree.find(4) is None
+    assert tree.min() == 1 and tree.max() == 9
+    assert tree.inorder() == [1, 3, 5, 7, 9]
+    assert tree.irange(2, 8) == [3, 5, 7]
+    assert tree.irange(2, 8, reverse=True) == [7, 5, 3]
+    assert tree.rank(5) == 2 and tree.select(-1) == 9
+    assert tree.count_range(3, 7) == 3
+    assert tree.get_successor(5) == 7
+    assert tree.delete_many([1, 9, 100]) == 2
+    assert tree.del_value(3) and tree.inorder() == [5, 7]
+    tree.delete()
+    assert len(tree) == 0
+
+
+def test_wraps_given_tree():
+    inner = BSTree(values=[2, 1])
+    tree = ConcurrentBSTree(inner)
+    tree.insert(3)
+    assert inner.inorder() == [1, 2, 3]
+
+
+def test_concurrent_writers():
+    tree = ConcurrentBSTree()
+    values = random.sample(range(100_000), k=4000)
+    chunks = [values[i::8] for i in range(8)]
+
+    def work(chunk):
+        for v in chunk[: len(chunk) // 2]:
+            tree.insert(v)
+        tree.insert_many(chunk[len(chunk) // 2 :])
+        tree.irange(0, 1000)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(work, chunks))
+    assert len(tree) == len(values)
+    assert tree.inorder() == sorted(values)
+
+
+def test_rwlock_readers_share():
+    lock = RWLock()
+    timed_out = []
+    barrier = threading.Barrier(3, timeout=5)
+
+    def reader():
+        with lock.read():
+            try:
+                barrier.wait()  # all readers in at once, or timeout
+            except threading.BrokenBarrierError:
+                timed_out.append(1)
+            else:
+                timed_out.append(0)
+
+    threads = [threading.Thread(target=reader) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert timed_out == [0, 0, 0]
+
+
+def test_rwlock_writer_exclusive():
+    lock = RWLock()
+    events = []
+
+    def writer():
+        with lock.write():
+            events.append("w")
+
+    with lock.read():
+        t = threading.Thread(target=writer)
+        t.start()
+        time.sleep(0.05)
+        assert not events  # writer waits for the reader
+    t.join()
+    assert events == ["w"]
+
+
+def test_find_returns_value_not_node():
+    tree = ConcurrentBSTree()
+    tree.insert_many(range(10))
+    found = tree.find(5)
+    tree.delete_many(range(6))  # moves values between nodes
+    assert found == 5 and tree.find(5) is None
+
+
+def test_concurrent_type_mismatches():
+    inner = BSTree(values=[1, 2, 3])
+    tree = ConcurrentBSTree(inner)
+
+    def work(_):
+        for _ in range(500):
+            assert "x" not in tree and tree.find(1.5) is None
+            assert tree.get_successor("x") == -1
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(work, range(8)))
+    assert inner.type_mismatches == 8 * 500 * 3
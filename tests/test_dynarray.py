@@ -1,6 +1,12 @@
+import gc
+import random
+import sys
+import weakref
+from collections import deque
+
 import pytest
 
-from dspy.dyn_array import DynamicArray
+from dspy.dyn_array import ArrayView, CircularArray, DynamicArray, ResizePolicy
 
 
 def test_init_empty():
@@ -112,8 +118,8 @@ def test_append():
 def test_append_with_resize():
     a = DynamicArray(val=(1,))
     init_cap = a._cap
-    a.append(2)
-    a.append(3)
+    for i in range(init_cap):
+        a.append(i)
     assert a._cap == init_cap * 2
 
 
@@ -177,8 +183,537 @@ def test_remove_three():
 
 def test_maybe_shrink():
     a = DynamicArray(val=(1,))
-    a._resize(8)
-    big_cap = a._cap
-    # now len is 1, cap is 8
+    a._resize(32)
+    # now len is 1, cap is 32
     a._maybe_shrink()
-    assert a._cap == big_cap // 2
+    assert a._cap == a.policy.min_capacity
+
+
+def test_unknown_dtype():
+    with pytest.raises(ValueError, match="dtype"):
+        DynamicArray(dtype="i3")
+
+
+@pytest.mark.parametrize(
+    "dtype, itemsize", [("i1", 1), ("i4", 4), ("i8", 8), ("f8", 8)]
+)
+def test_typed_basic(dtype, itemsize):
+    a = DynamicArray(val=(1, 2, 3), dtype=dtype)
+    assert a.dtype == dtype and a.itemsize == itemsize
+    a.append(4)
+    a.insert(0, 0)
+    del a[2]
+    assert a.pop() == 4
+    assert [int(x) for x in a] == [0, 1, 3]
+    assert len(a) == 3
+
+
+def test_typed_rejects_values():
+    a = DynamicArray(dtype="i1")
+    with pytest.raises(ValueError):
+        a.append(300)
+    with pytest.raises(TypeError):
+        a.append("a")
+    assert len(a) == 0
+
+
+def test_typed_buffer_zero_copy():
+    a = DynamicArray(val=range(5), dtype="i8")
+    view = a.buffer()
+    assert view.tolist() == [0, 1, 2, 3, 4]
+    assert view.format == "q" and view.nbytes == 5 * 8
+    a[1] = 100
+    assert view[1] == 100  # shares memory
+    view[2] = -1
+    assert a[2] == -1
+
+
+@pytest.mark.skipif(sys.version_info < (3, 12), reason="__buffer__ needs 3.12")
+def test_typed_memoryview_protocol():
+    a = DynamicArray(val=range(5), dtype="f8")
+    assert memoryview(a).tolist() == [0.0, 1.0, 2.0, 3.0, 4.0]
+
+
+def test_typed_numpy_zero_copy():
+    np = pytest.importorskip("numpy")
+    a = DynamicArray(val=range(5), dtype="i4")
+    arr = np.asarray(a)
+    assert arr.dtype == np.int32 and arr.tolist() == [0, 1, 2, 3, 4]
+    arr[0] = 42
+    assert a[0] == 42
+
+
+def test_numpy_copies():
+    np = pytest.importorskip("numpy")
+    a = DynamicArray(val=range(5), dtype="i8")
+    copied = np.array(a, copy=True)
+    copied[0] = 42
+    assert a[0] == 0 and not np.shares_memory(copied, np.asarray(a))
+    assert np.asarray(a, dtype="f8").tolist() == [0.0, 1.0, 2.0, 3.0, 4.0]
+    with pytest.raises(ValueError):
+        np.array(a, dtype="f8", copy=False)
+    boxed = DynamicArray(val=[1, 2, 3])
+    assert np.asarray(boxed).tolist() == [1, 2, 3]
+    assert np.asarray(boxed, dtype="f4").dtype == np.float32
+    with pytest.raises(ValueError):
+        np.array(boxed, copy=False)
+
+
+def test_boxed_has_no_buffer():
+    with pytest.raises(TypeError, match="Boxed"):
+        DynamicArray(val=(1, 2)).buffer()
+
+
+def test_refcounts_balanced():
+    obj = object()
+    base = sys.getrefcount(obj)
+    a = DynamicArray()
+    for _ in range(50):
+        a.append(obj)
+    assert sys.getrefcount(obj) == base + 50
+    for i in range(0, 40, 3):
+        a.insert(i, obj)
+    del a[0]
+    del a[5]
+    a[3] = obj
+    a.pop()
+    assert sys.getrefcount(obj) == base + len(a)
+    for _ in range(len(a) - 2):
+        del a[1]  # shrinks a few times
+    assert sys.getrefcount(obj) == base + 2
+    del a
+    assert sys.getrefcount(obj) == base
+
+
+def test_old_storage_released():
+    obj = object()
+    base = sys.getrefcount(obj)
+    a = CircularArray(val=[obj] * 6)
+    for _ in range(4):
+        a.pop_front()
+        a.append(obj)  # wraps around the storage end
+    slots = a._slots
+    a.extend([obj] * 20)  # grows, references move out of old storage
+    assert slots.objs.count(None) == len(slots.objs)
+    assert sys.getrefcount(obj) == base + 26
+    b = DynamicArray(val=[obj] * 10)
+    for _ in range(7):
+        b.pop()
+    assert sys.getrefcount(obj) == base + 29
+    del a, b, slots
+    assert sys.getrefcount(obj) == base
+
+
+def test_reference_cycle_collected():
+    class Node:
+        pass
+
+    a, n = DynamicArray(), Node()
+    n.arr = a
+    a.append(n)
+    ref = weakref.ref(n)
+    del a, n
+    gc.collect()
+    assert ref() is None
+
+
+def test_setitem_releases_old():
+    old, new = object(), object()
+    base = sys.getrefcount(old)
+    a = DynamicArray(val=[old, old])
+    a[0] = new
+    assert sys.getrefcount(old) == base + 1 and a[0] is new and a[1] is old
+
+
+@pytest.mark.parametrize("dtype", [None, "i8"])
+def test_insert_delete_order(dtype):
+    a = DynamicArray(val=list(range(10)), dtype=dtype)
+    want = list(range(10))
+    for idx, val in [(0, 100), (5, 200), (-1, 300), (3, 400)]:
+        a.insert(idx, val)
+        want.insert(idx if idx >= 0 else len(want) + idx, val)
+    for idx in (0, 4, -1):
+        del a[idx]
+        del want[idx]
+    assert list(a) == want
+
+
+def test_typed_insert_rejected_keeps_array():
+    a = DynamicArray(val=[1, 2, 3], dtype="i1")
+    with pytest.raises(ValueError):
+        a.insert(1, 1000)
+    assert list(a) == [1, 2, 3]
+
+
+def test_resize_policy_growth():
+    a = DynamicArray(policy=ResizePolicy(growth_factor=1.5, min_capacity=4))
+    caps = []
+    for i in range(20):
+        a.append(i)
+        if not caps or caps[-1] != a.capacity:
+            caps.append(a.capacity)
+    assert caps == [4, 6, 9, 13, 19, 28]
+    assert a.resizes == 5
+    assert a.bytes_copied == (4 + 6 + 9 + 13 + 19) * a.itemsize
+    assert list(a) == list(range(20))
+
+
+def test_resize_policy_no_thrashing():
+    a = DynamicArray(dtype="i8")
+    for i in range(64):
+        a.append(i)
+    a.append(0)  # full, grows once
+    a.pop()
+    resizes = a.resizes
+    # append/pop around a capacity boundary doesn't reallocate
+    for _ in range(100):
+        a.append(0)
+        a.pop()
+    assert a.resizes == resizes
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"growth_factor": 1},
+        {"growth_factor": 2, "shrink_threshold": 0.5},
+        {"min_capacity": 0},
+    ],
+)
+def test_resize_policy_invalid(kwargs):
+    with pytest.raises(ValueError):
+        ResizePolicy(**kwargs)
+
+
+def test_reserve_and_shrink_to_fit():
+    a = DynamicArray(dtype="i4")
+    a.reserve(1000)
+    assert a.capacity == 1000 and a.resizes == 1
+    for i in range(1000):
+        a.append(i)
+    assert a.resizes == 1
+    a.reserve(10)  # enough room already
+    assert a.capacity == 1000
+    for _ in range(900):
+        a.pop()
+    a.shrink_to_fit()
+    assert a.capacity == len(a) == 100
+    assert list(a) == list(range(100))
+
+
+def test_pop_front():
+    a = DynamicArray(val=[1, 2, 3])
+    assert a.pop_front() == 1 and list(a) == [2, 3]
+    with pytest.raises(IndexError):
+        DynamicArray().pop_front()
+
+
+@pytest.mark.parametrize("dtype", [None, "i8"])
+def test_circular_matches_list(dtype):
+    rnd = random.Random(7)
+    a, want = CircularArray(dtype=dtype), []
+    for _ in range(3000):
+        op, val = rnd.random(), rnd.randint(0, 1000)
+        if op < 0.25:
+            a.append(val)
+            want.append(val)
+        elif op < 0.5:
+            a.prepend(val)
+            want.insert(0, val)
+        elif not want:
+            continue
+        elif op < 0.6:
+            assert a.pop() == want.pop()
+        elif op < 0.7:
+            assert a.pop_front() == want.pop(0)
+        elif op < 0.8:
+            idx = rnd.randrange(len(want))
+            a.insert(idx, val)
+            want.insert(idx, val)
+        elif op < 0.9:
+            idx = rnd.randrange(-len(want), len(want))
+            del a[idx]
+            del want[idx]
+        else:
+            idx = rnd.randrange(len(want))
+            a[idx] = val
+            want[idx] = val
+        assert len(a) == len(want)
+    assert list(a) == want
+
+
+def test_circular_queue_no_resizes():
+    a = CircularArray(val=range(6))
+    want = deque(range(6))
+    # the window walks around the storage many times
+    for i in range(1000):
+        a.append(i)
+        want.append(i)
+        assert a.pop_front() == want.popleft()
+    for i in range(1000):
+        a.prepend(i)
+        want.appendleft(i)
+        assert a.pop() == want.pop()
+    assert list(a) == list(want)
+    assert a.resizes == 0 and a.capacity == 8
+
+
+def test_circular_buffer_unwraps():
+    a = CircularArray(val=[3, 4, 5], dtype="i4")
+    for val in (2, 1, 0):
+        a.prepend(val)  # wraps to the end of the storage
+    assert a.buffer().tolist() == [0, 1, 2, 3, 4, 5]
+    assert list(a) == [0, 1, 2, 3, 4, 5]
+
+
+def test_circular_typed_rejected_keeps_array():
+    a = CircularArray(val=[1, 2, 3, 4], dtype="i1")
+    a.prepend(0)
+    for idx in (1, 3):
+        with pytest.raises(ValueError):
+            a.insert(idx, 1000)
+    with pytest.raises(ValueError):
+        a.prepend(1000)
+    assert list(a) == [0, 1, 2, 3, 4]
+
+
+def test_circular_refcounts_balanced():
+    obj = object()
+    base = sys.getrefcount(obj)
+    a = CircularArray()
+    for i in range(30):
+        a.prepend(obj) if i % 2 else a.append(obj)
+    for i in range(0, 20, 3):
+        a.insert(i, obj)
+    del a[1]
+    del a[-2]
+    a.pop_front()
+    a.pop()
+    assert sys.getrefcount(obj) == base + len(a)
+    while len(a) > 2:
+        a.pop_front()  # shrinks a few times
+    assert sys.getrefcount(obj) == base + 2
+    del a
+    assert sys.getrefcount(obj) == base
+
+
+@pytest.mark.parametrize("cls", [DynamicArray, CircularArray])
+@pytest.mark.parametrize("dtype", [None, "i8"])
+def test_remove_if_single_resize(cls, dtype):
+    a = cls(val=list(range(1000)), dtype=dtype)
+    if cls is CircularArray:
+        for val in range(10, 60, 10):
+            a.prepend(-val)  # elements wrap around the storage end
+    want = [val for val in a if val % 10 == 0]
+    resizes = a.resizes
+    assert a.remove_if(lambda val: val % 10) == 900
+    assert list(a) == want
+    assert a.resizes == resizes + 1
+
+
+@pytest.mark.parametrize("cls", [DynamicArray, CircularArray])
+def test_delete_many(cls):
+    a = cls(val=list(range(20)))
+    a.prepend(-1) if cls is CircularArray else a.insert(0, -1)
+    assert a.delete_many([0, -1, 5, 5, 3, 19, -2]) == 5
+    assert list(a) == [0, 1, 3, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15, 16, 17]
+    with pytest.raises(IndexError):
+        a.delete_many([1, 100])
+    assert len(a) == 16
+    assert a.delete_many([]) == 0
+
+
+def test_remove_if_predicate_raises_keeps_array():
+    a = DynamicArray(val=[1, 2, "x", 3])
+    with pytest.raises(TypeError):
+        a.remove_if(lambda val: val > 1)
+    assert list(a) == [1, 2, "x", 3]
+
+
+def test_remove_count_and_refcounts():
+    obj = object()
+    base = sys.getrefcount(obj)
+    a = DynamicArray(val=[obj, 1, obj, obj, 2, obj])
+    assert a.remove(obj) == 4
+    assert list(a) == [1, 2]
+    assert sys.getrefcount(obj) == base
+
+
+def _linear_find(values, val):
+    for i, elem in enumerate(values):
+        if isinstance(elem, type(val)) and elem == val:
+            return i
+    return -1
+
+
+@pytest.mark.parametrize("cls", [DynamicArray, CircularArray])
+def test_indexed_find_matches_scan(cls):
+    rnd = random.Random(3)
+    pool = [0, 1, 2, 1.0, True, "a", "b", float("nan"), (1,), None]
+    a = cls(val=pool[:5], indexed=True)
+    want = pool[:5]
+    for _ in range(2000):
+        op, val = rnd.random(), rnd.choice(pool)
+        if op < 0.3 or not want:
+            a.append(val)
+            want.append(val)
+        elif op < 0.4:
+            a.prepend(val)
+            want.insert(0, val)
+        elif op < 0.5:
+            a.pop()
+            want.pop()
+        elif op < 0.6:
+            a.pop_front()
+            want.pop(0)
+        elif op < 0.7:
+            idx = rnd.randrange(len(want))
+            a.insert(idx, val)
+            want.insert(idx, val)
+        elif op < 0.8:
+            idx = rnd.randrange(len(want))
+            del a[idx]
+            del want[idx]
+        elif op < 0.95:
+            idx = rnd.randrange(len(want))
+            a[idx] = val
+            want[idx] = val
+        else:
+            a.remove(val)
+            want = [elem for elem in want if _linear_find([elem], val)]
+        for val in pool:
+            assert a.find(val) == _linear_find(want, val)
+    assert a.indexed and list(a) == want
+
+
+def test_indexed_queue_stays_fresh():
+    a = CircularArray(val=range(100), indexed=True)
+    for i in range(100, 1000):
+        a.append(i)
+        a.pop_front()
+        assert not a._index.stale
+        assert a.find(i - 50) == 49 and i - 100 not in a
+
+
+def test_indexed_typed_rounding():
+    a = DynamicArray(val=[0.1, 0.5], dtype="f4", indexed=True)
+    a[1] = 0.1
+    # f4 stores 0.1 rounded, find looks for the stored value
+    assert a.find(0.1) == -1 and a.find(a[0]) == 0
+    assert 0.5 not in a
+
+
+def test_indexed_unhashable_falls_back():
+    a = DynamicArray(val=[[1], 2, [3]], indexed=True)
+    assert a.find([3]) == 2 and 2 in a
+    a.remove([1])
+    a.remove([3])
+    assert a.find(2) == 0 and not a._index.unhashable
+
+
+@pytest.mark.parametrize("cls", [DynamicArray, CircularArray])
+@pytest.mark.parametrize("dtype", [None, "f8"])
+def test_indexed_nan(cls, dtype):
+    nan = float("nan")
+    a = cls(val=[1.0, nan], dtype=dtype, indexed=True)
+    assert a.find(1.0) == 0 and a._index.unhashable == 1
+    last = a.pop()
+    assert last != last and a.pop() == 1.0 and not a._index.unhashable
+    a.extend([nan, 1.0, nan])
+    a[0] = 2.0
+    assert a.pop_front() == 2.0 and a.find(1.0) == 0
+    a[1] = 3.0
+    assert a.find(3.0) == 1 and 1.0 in a and not a._index.unhashable
+
+
+@pytest.mark.parametrize("cls", [DynamicArray, CircularArray])
+@pytest.mark.parametrize("dtype", [None, "i8"])
+def test_slices_match_list(cls, dtype):
+    a = cls(val=list(range(20)), dtype=dtype)
+    want = list(range(20))
+    for key in [
+        slice(None),
+        slice(3, 15),
+        slice(None, None, 3),
+        slice(None, None, -1),
+        slice(-2, 3, -4),
+        slice(30, 40),
+    ]:
+        view = a[key]
+        assert isinstance(view, ArrayView) and list(view) == want[key]
+        assert list(view[1::2]) == want[key][1::2]
+        assert len(view) == len(want[key])
+
+
+@pytest.mark.parametrize("dtype", [None, "i4"])
+def test_slice_copy_on_write(dtype):
+    a = DynamicArray(val=list(range(10)), dtype=dtype)
+    view = a[2:8:2]
+    assert view._slots is a._slots and a.bytes_copied == 0
+    a[2] = 100  # parent copies, view keeps old values
+    assert list(view) == [2, 4, 6] and a[2] == 100
+    view[0] = -1  # view detaches into own storage
+    view.append(42)
+    assert list(view) == [-1, 4, 6, 42]
+    assert list(a) == [0, 1, 100] + list(range(3, 10))
+
+
+def test_typed_view_buffer_is_strided():
+    a = DynamicArray(val=list(range(10)), dtype="i8")
+    view = a[::-3]
+    assert view.buffer().tolist() == [9, 6, 3, 0]
+    assert view.buffer().obj is a.buffer().obj  # no copy
+
+
+def test_circular_slice_unwraps():
+    a = CircularArray(val=[3, 4, 5, 6])
+    for val in (2, 1, 0):
+        a.prepend(val)
+    assert list(a[1:6]) == [1, 2, 3, 4, 5]
+    a.pop_front()
+    assert list(a[::2]) == [1, 3, 5]
+
+
+def test_view_refcounts_balanced():
+    obj = object()
+    base = sys.getrefcount(obj)
+    a = DynamicArray(val=[obj] * 10)
+    view = a[::2]
+    a[0] = None  # copy
+    view.append(obj)  # copy
+    del a
+    assert list(view) == [obj] * 6
+    del view
+    assert sys.getrefcount(obj) == base
+
+
+@pytest.mark.parametrize("cls", [DynamicArray, CircularArray])
+@pytest.mark.parametrize("dtype", [None, "f8"])
+def test_extend_single_resize(cls, dtype):
+    a = cls(val=[1.0], dtype=dtype)
+    if cls is CircularArray:
+        a.prepend(0.0)  # elements wrap around the storage end
+    else:
+        a.insert(0, 0.0)
+    resizes = a.resizes
+    a.extend(float(i) for i in range(2, 100))
+    assert list(a) == [float(i) for i in range(100)]
+    assert a.resizes == resizes + 1
+    a.extend([])
+    a.extend(DynamicArray(val=[5.0, 6.0], dtype=dtype))
+    assert list(a[-2:]) == [5.0, 6.0]
+
+
+def test_extend_typed_rejected_keeps_array():
+    a = DynamicArray(val=[1, 2], dtype="i1")
+    with pytest.raises(ValueError):
+        a.extend([3, 1000])
+    with pytest.raises(TypeError):
+        a.extend([3, "x"])
+    assert list(a) == [1, 2]
+
+
+def test_extend_indexed():
+    a = DynamicArray(val=["a"], indexed=True)
+    a.extend("bcb")
+    assert a.find("b") == 1 and "c" in a and a.find("d") == -1
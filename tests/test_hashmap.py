@@ -1,4 +1,8 @@
-from dspy.hashmap import Item, MyHashMap
+import random
+
+import pytest
+
+from dspy.hashmap import DEL_FLAG, PROBING, Item, MyHashMap, RobinHoodHashMap
 
 
 def test_init():
@@ -35,3 +39,160 @@ def test_add_item_update():
     for key, value in (first, second):
         hm._add_item(key, value, table)
     assert Item(*first) not in table and Item(*second) in table
+
+
+def test_add_item_update_keeps_single_item():
+    table = [None] * 16
+    hm = MyHashMap()
+    hm._add_item(10, 13, table)
+    assert not hm._add_item(10, 42, table)
+    assert [item for item in table if item is not None] == [Item(10, 42)]
+
+
+def test_put_get_remove():
+    hm = MyHashMap()
+    hm.put(1, 1)
+    hm.put(2, 2)
+    assert hm.get(1) == 1 and hm.get(3) == -1
+    hm.put(2, 1)
+    assert hm.get(2) == 1 and len(hm) == 2
+    hm.remove(2)
+    hm.remove(2)
+    assert hm.get(2) == -1 and len(hm) == 1
+
+
+def test_grows_at_load_factor():
+    hm = MyHashMap(capacity=8, load_factor=0.5)
+    for key in range(100):
+        hm.put(key, key * 10)
+        assert hm._size + hm._deleted <= 0.5 * hm._cap
+    assert hm._cap == 256
+    assert all(hm.get(key) == key * 10 for key in range(100))
+
+
+def test_tombstones_compacted():
+    hm = MyHashMap(capacity=64, tombstone_ratio=0.25)
+    for key in range(30):
+        hm.put(key, key)
+    for key in range(16):
+        hm.remove(key)
+    # 17th tombstone would pass 64 * 0.25
+    assert hm._deleted == 16
+    hm.remove(16)
+    assert hm._deleted == 0 and hm._cap == 64
+    assert all(el is not DEL_FLAG for el in hm._table)
+    assert [hm.get(key) for key in range(15, 19)] == [-1, -1, 17, 18]
+
+
+def test_put_reuses_tombstone():
+    hm = MyHashMap(capacity=64)
+    for key in (1, 65):  # same home slot
+        hm.put(key, key)
+    hm.remove(1)
+    hm.put(129, 0)  # takes the tombstone slot
+    assert hm._deleted == 0 and len(hm) == 2
+    assert hm._table[1] == Item(129, 0) and hm.get(65) == 65
+
+
+def test_churn_compacts_instead_of_growing():
+    hm = MyHashMap(capacity=64, tombstone_ratio=0.9)
+    for key in range(10_000):
+        hm.put(key, key)
+        hm.remove(key - 5)
+    assert len(hm) == 5 and hm._cap == 64
+
+
+def test_matches_dict():
+    rnd = random.Random(5)
+    hm, want = MyHashMap(capacity=4), {}
+    for _ in range(5000):
+        key = rnd.randint(0, 500)
+        if rnd.random() < 0.6:
+            value = rnd.randint(0, 100)
+            hm.put(key, value)
+            want[key] = value
+        else:
+            hm.remove(key)
+            want.pop(key, None)
+    assert len(hm) == len(want)
+    assert all(hm.get(key) == want.get(key, -1) for key in range(501))
+
+
+@pytest.mark.parametrize("kwargs", [{"load_factor": 1}, {"tombstone_ratio": 0}])
+def test_bad_ratios(kwargs):
+    with pytest.raises(ValueError):
+        MyHashMap(**kwargs)
+
+
+def _maps():
+    maps = [lambda probing=probing: MyHashMap(probing=probing) for probing in PROBING]
+    return maps + [RobinHoodHashMap]
+
+
+@pytest.mark.parametrize("factory", _maps())
+def test_strategies_match_dict(factory):
+    rnd = random.Random(11)
+    hm, want = factory(), {}
+    for _ in range(5000):
+        key = rnd.choice([rnd.randint(0, 300), rnd.randint(-(10 ** 15), 10 ** 15)])
+        if rnd.random() < 0.6:
+            value = rnd.randint(0, 100)
+            hm.put(key, value)
+            want[key] = value
+        elif want and rnd.random() < 0.5:
+            key = rnd.choice(list(want))
+            hm.remove(key)
+            del want[key]
+        else:
+            hm.remove(key)
+            want.pop(key, None)
+    assert len(hm) == len(want)
+    assert all(hm.get(key) == value for key, value in want.items())
+    stats = hm.probe_stats()
+    assert sum(stats["histogram"].values()) == len(want)
+    assert stats["max"] == max(stats["histogram"])
+
+
+@pytest.mark.parametrize("probing", PROBING)
+def test_probing_visits_all_slots(probing):
+    hm = MyHashMap(capacity=64, probing=probing)
+    for key in (0, 7, 12345, -3, 10 ** 15):
+        slots = {hm._key2idx(key, trial, 64) for trial in range(64)}
+        assert slots == set(range(64))
+
+
+def test_double_hashing_steps_scatter():
+    steps = [MyHashMap._step(key) % 1024 for key in range(64)]
+    assert all(step % 2 for step in steps) and steps[0] != 1
+    diffs = {(b - a) % 1024 for a, b in zip(steps, steps[1:])}
+    assert len(set(steps)) > 56 and len(diffs) > 56  # no progression
+
+
+def test_probe_stats_sequential_cluster():
+    # ids 0..n-1 fill a solid run, ids shifted by the table size hit it
+    keys = list(range(200)) + [1024 + key for key in range(0, 200, 10)]
+    stats = {}
+    for probing in PROBING:
+        hm = MyHashMap(capacity=1024, probing=probing)
+        for key in keys:
+            hm.put(key, key)
+        stats[probing] = hm.probe_stats()
+    assert stats["linear"]["max"] > 150
+    assert stats["quadratic"]["max"] < 30 and stats["double"]["max"] < 10
+    assert stats["linear"]["histogram"][1] == 200
+
+
+def test_robin_hood_backward_shift():
+    hm = RobinHoodHashMap(capacity=16)
+    for key in (1, 17, 33, 2, 3):  # 1, 17, 33 share home slot 1
+        hm.put(key, key)
+    hm.remove(17)
+    assert DEL_FLAG not in hm._table
+    assert [item and item.key for item in hm._table[1:6]] == [1, 33, 2, 3, None]
+    assert hm.get(33) == 33 and hm.get(17) == -1
+    assert hm.probe_stats()["histogram"] == {1: 1, 2: 3}
+
+
+def test_unknown_probing():
+    with pytest.raises(ValueError, match="probing"):
+        MyHashMap(probing="cuckoo")
@@ -0,0 +1,83 @@
+import random
+
+import pytest
+
+from dspy.bstree import AVLTree, BSTree
+from dspy.compact_bstree import CompactBSTree
+from dspy.mapped_bstree import MappedBSTree
+
+
+@pytest.fixture(params=[int, float, str])
+def values(request):
+    nums = random.sample(range(-5000, 5000), k=500)
+    if request.param is float:
+        return [n / 7 for n in nums]
+    if request.param is str:
+        return [f"key-{n}-ü" for n in nums]
+    return nums
+
+
+def test_roundtrip_mmap(tmp_path, values):
+    path = tmp_path / "tree.bin"
+    AVLTree(values=values).dump(path)
+    ordered = sorted(values)
+    with BSTree.load(path) as tree:
+        assert isinstance(tree, MappedBSTree)
+        assert len(tree) == tree.get_node_count() == len(values)
+        assert tree.inorder() == ordered
+        assert tree.min() == ordered[0] and tree.max() == ordered[-1]
+        for k in (0, 17, len(values) - 1):
+            v = ordered[k]
+            assert v in tree and tree.find(v) == k
+            assert tree.rank(v) == k and tree.select(k) == v
+        assert tree.get_successor(ordered[3]) == ordered[4]
+        assert tree.get_successor(ordered[-1]) == -1
+        lo, hi = ordered[100], ordered[200]
+        assert list(tree.irange(lo, hi)) == ordered[100:201]
+        assert list(tree.irange(lo, hi, reverse=True)) == ordered[100:201][::-1]
+        assert tree.count_range(lo, hi) == 101
+
+
+def test_roundtrip_build(tmp_path, values):
+    path = tmp_path / "tree.bin"
+    CompactBSTree(values=values).dump(path)
+    tree = AVLTree.load(path, mmap=False)
+    assert isinstance(tree, AVLTree)
+    assert tree.inorder() == sorted(values)
+    assert tree.height() <= len(values).bit_length()
+
+
+def test_missing_and_mismatch(tmp_path):
+    path = tmp_path / "tree.bin"
+    BSTree(values=[1, 5, 3]).dump(path)
+    with BSTree.load(path) as tree:
+        assert 2 not in tree and "a" not in tree and 1.0 not in tree
+        assert tree.find(6) is None and tree.get_successor(2) == -1
+        with pytest.raises(IndexError):
+            tree.select(3)
+
+
+def test_empty(tmp_path):
+    path = tmp_path / "tree.bin"
+    BSTree().dump(path)
+    with BSTree.load(path) as tree:
+        assert len(tree) == 0 and tree.inorder() == []
+        assert tree.min() is None and 1 not in tree
+    assert BSTree.load(path, mmap=False).root is None
+
+
+def test_unsupported(tmp_path):
+    with pytest.raises(ValueError, match="type"):
+        BSTree(values=[(1, 2)]).dump(tmp_path / "tree.bin")
+    with pytest.raises(ValueError, match="range"):
+        BSTree(values=[2 ** 70]).dump(tmp_path / "tree.bin")
+
+
+def test_not_a_dump(tmp_path):
+    path = tmp_path / "junk.bin"
+    path.write_bytes(b"x" * 100)
+    with pytest.raises(ValueError, match="not a tree dump"):
+        MappedBSTree(path)
+    path.write_bytes(b"")
+    with pytest.raises(ValueError, match="not a tree dump"):
+        MappedBSTree(path)
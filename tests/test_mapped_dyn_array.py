@@ -0,0 +1,128 @@
+import os
+
+import pytest
+
+from dspy.dyn_array import ResizePolicy
+from dspy.mapped_dyn_array import MappedArray
+
+
+@pytest.mark.parametrize(
+    "dtype, values", [("i8", [-5, 0, 2 ** 40]), ("f4", [0.5, -2.0])]
+)
+def test_roundtrip(tmp_path, dtype, values):
+    path = tmp_path / "col.bin"
+    with MappedArray(path, dtype=dtype) as arr:
+        for val in values * 50:
+            arr.append(val)
+        arr[1] = values[0]
+    with MappedArray(path) as arr:
+        want = values * 50
+        want[1] = values[0]
+        assert arr.dtype == dtype and list(arr) == want
+        assert arr.buffer().tolist() == want
+
+
+def test_grows_file_by_policy(tmp_path):
+    path = tmp_path / "col.bin"
+    policy = ResizePolicy(growth_factor=1.5, min_capacity=4)
+    with MappedArray(path, dtype="i4", policy=policy) as arr:
+        for i in range(10):
+            arr.append(i)
+        assert arr.capacity == 13 and arr.resizes == 3
+        assert arr.bytes_copied == 0
+        assert os.path.getsize(path) == 24 + 13 * 4
+        assert arr[-1] == 9 and 5 in arr
+
+
+def test_flush_persists_size(tmp_path):
+    path = tmp_path / "col.bin"
+    arr = MappedArray(path, dtype="u2")
+    for i in range(3):
+        arr.append(i)
+    arr.flush()
+    with MappedArray(path, dtype="u2") as other:
+        assert list(other) == [0, 1, 2]
+    arr.close()
+
+
+def test_no_shrink_under_views(tmp_path):
+    with MappedArray(tmp_path / "col.bin", dtype="i8") as arr:
+        for i in range(100):
+            arr.append(i)
+        view = arr.buffer()
+        cap = arr.capacity
+        while len(arr) > 5:
+            arr.pop()
+        assert arr.capacity == cap and view[50] == 50
+        with pytest.raises(BufferError):
+            arr.shrink_to_fit()
+        assert list(arr) == [0, 1, 2, 3, 4]
+        view.release()
+        arr.shrink_to_fit()
+        assert arr.capacity == 5
+
+
+def test_grow_under_views(tmp_path):
+    with MappedArray(tmp_path / "col.bin", dtype="i8") as arr:
+        arr.append(7)
+        view = arr.buffer()
+        for i in range(100):
+            arr.append(i)
+        # old view keeps the old mapping alive
+        assert view[0] == 7 and len(arr) == 101
+        del view
+
+
+def test_bad_files(tmp_path):
+    with pytest.raises(ValueError, match="dtype"):
+        MappedArray(tmp_path / "new.bin")
+    path = tmp_path / "junk.bin"
+    path.write_bytes(b"not an array at all, really")
+    with pytest.raises(ValueError, match="not an array"):
+        MappedArray(path)
+    with MappedArray(tmp_path / "col.bin", dtype="i8"):
+        pass
+    with pytest.raises(ValueError, match="holds i8"):
+        MappedArray(tmp_path / "col.bin", dtype="f8")
+
+
+def test_slice_is_copy(tmp_path):
+    with MappedArray(tmp_path / "col.bin", dtype="i8") as arr:
+        arr.extend(range(10))
+        part = arr[::3]
+        arr[0] = 100
+        assert list(part) == [0, 3, 6, 9] and part.dtype == "i8"
+
+
+def test_close_under_views(tmp_path):
+    arr = MappedArray(tmp_path / "col.bin", dtype="i8")
+    arr.extend(range(10))
+    view = arr.buffer()
+    with pytest.raises(BufferError):
+        arr.close()
+    arr.append(10)
+    assert arr[0] == 0 and arr[-1] == 10 and view[9] == 9
+    view.release()
+    arr.close()
+    with MappedArray(tmp_path / "col.bin") as arr:
+        assert list(arr) == list(range(11))
+
+
+def test_close_twice(tmp_path):
+    arr = MappedArray(tmp_path / "col.bin", dtype="i8")
+    arr.extend(range(5))
+    arr.close()
+    arr.close()
+    with MappedArray(tmp_path / "col.bin") as arr:
+        assert list(arr) == list(range(5))
+        arr.close()
+
+
+def test_dropped_without_close(tmp_path):
+    path = tmp_path / "col.bin"
+    arr = MappedArray(path, dtype="i4")
+    for i in range(100):
+        arr.append(i)
+    del arr
+    with MappedArray(path) as arr:
+        assert len(arr) == 100 and arr[99] == 99
@@ -0,0 +1,109 @@
+import random
+
+import pytest
+
+from dspy.persistent_bstree import PersistentBSTree, sharing_stats
+
+
+def _is_avl(node) -> bool:
+    if node is None:
+        return True
+    left = node.left.height if node.left else -1
+    right = node.right.height if node.right else -1
+    size = 1 + (node.left.size if node.left else 0)
+    size += node.right.size if node.right else 0
+    ok = abs(left - right) <= 1 and node.height == max(left, right) + 1
+    ok = ok and node.size == size
+    return ok and _is_avl(node.left) and _is_avl(node.right)
+
+
+def test_insert_delete():
+    values = random.sample(range(10_000), k=1000)
+    tree = PersistentBSTree(values=values)
+    assert tree.inorder() == sorted(values) and _is_avl(tree.root)
+    for v in values[:600]:
+        assert tree.del_value(v)
+    assert tree.inorder() == sorted(values[600:])
+    assert tree.get_node_count() == 400 and _is_avl(tree.root)
+
+
+def test_snapshot_isolated():
+    tree = PersistentBSTree(values=list(range(100)))
+    snap = tree.snapshot()
+    for v in range(0, 100, 2):
+        tree.del_value(v)
+    for v in range(100, 200):
+        tree.insert(v)
+    assert snap.inorder() == list(range(100))
+    assert snap.get_node_count() == 100 and _is_avl(snap.root)
+    assert tree.inorder() == list(range(1, 100, 2)) + list(range(100, 200))
+
+
+def test_every_version_intact():
+    tree = PersistentBSTree()
+    versions, contents = [], []
+    current = set()
+    for _ in range(300):
+        v = random.randrange(100)
+        if v in current:
+            tree.del_value(v)
+            current.remove(v)
+        else:
+            tree.insert(v)
+            current.add(v)
+        versions.append(tree.snapshot())
+        contents.append(sorted(current))
+    for snap, want in zip(versions, contents):
+        assert snap.inorder() == want and _is_avl(snap.root)
+
+
+@pytest.mark.parametrize(
+    "op",
+    [
+        "update",
+        "intersection_update",
+        "difference_update",
+        "symmetric_difference_update",
+    ],
+)
+def test_snapshots_during_rebuild(op):
+    seen = []
+
+    class Watched(PersistentBSTree):
+        def _join(self, left, val, right):
+            snap = self.snapshot()  # a reader in the middle of the rebuild
+            seen.append((snap.get_node_count(), snap.is_bstree()))
+            return super()._join(left, val, right)
+
+    tree = Watched(values=list(range(0, 600, 2)))
+    other = PersistentBSTree.bulk_load(range(0, 600, 3))
+    getattr(tree, op)(other)  # big `other`, rebuilt from merged streams
+    assert seen and set(seen) == {(300, True)}
+    want = set(range(0, 600, 2))
+    getattr(want, op)(set(range(0, 600, 3)))
+    assert tree.inorder() == sorted(want) and _is_avl(tree.root)
+
+
+def test_snapshot_is_a_fork():
+    tree = PersistentBSTree(values=[2, 1, 3])
+    snap = tree.snapshot()
+    snap.insert(4)
+    assert 4 not in tree and 4 in snap
+
+
+def test_sharing_stats():
+    n = 1023
+    tree = PersistentBSTree.bulk_load(range(n))
+    old = tree.snapshot()
+    tree.insert(n)
+    stats = sharing_stats([old, tree])
+    assert stats["versions"] == 2
+    assert stats["logical_nodes"] == 2 * n + 1
+    # only path from the root to the new leaf is new
+    assert n < stats["physical_nodes"] <= n + 2 * tree.height() + 2
+    assert stats["sharing"] == pytest.approx(0.5, abs=0.02)
+
+
+def test_sharing_stats_empty():
+    stats = sharing_stats([PersistentBSTree()])
+    assert stats["physical_nodes"] == 0 and stats["sharing"] == 0.0
@@ -0,0 +1,75 @@
+import random
+
+import pytest
+
+from dspy import static_index
+from dspy.bstree import AVLTree, BSTree
+from dspy.static_index import StaticIndex
+
+
+@pytest.fixture
+def values():
+    return sorted(random.sample(range(10_000), k=1000))
+
+
+@pytest.mark.parametrize("n", [0, 1, 2, 3, 7, 8, 100])
+def test_layout_is_bfs_of_balanced_tree(n):
+    layout, ranks = static_index._eytzinger(list(range(n)))
+    # slot k: left subtree (2k) smaller, right subtree (2k + 1) bigger
+    for k in range(1, n + 1):
+        assert ranks[k] == layout[k]
+        if 2 * k <= n:
+            assert layout[2 * k] < layout[k]
+        if 2 * k + 1 <= n:
+            assert layout[2 * k + 1] > layout[k]
+
+
+def test_contains_rank(values):
+    index = StaticIndex(values)
+    assert len(index) == len(values)
+    members = set(values)
+    for key in range(-5, 10_005, 7):
+        assert (key in index) == (key in members)
+        assert index.rank(key) == sum(v < key for v in values)
+
+
+def test_batch_python(values, monkeypatch):
+    monkeypatch.setattr(static_index, "np", None)
+    index = StaticIndex(values)
+    assert not index.vectorised
+    keys = [random.randrange(-100, 10_100) for _ in range(500)]
+    members = set(values)
+    assert index.contains_many(keys) == [k in members for k in keys]
+    assert index.rank_many(keys) == [sum(v < k for v in values) for k in keys]
+
+
+def test_batch_numpy(values):
+    np = pytest.importorskip("numpy")
+    index = StaticIndex(values)
+    assert index.vectorised
+    keys = np.array([random.randrange(-100, 10_100) for _ in range(500)])
+    members = set(values)
+    assert index.contains_many(keys).tolist() == [k in members for k in keys]
+    assert index.rank_many(keys).tolist() == [sum(v < k for v in values) for k in keys]
+
+
+def test_strings():
+    index = StaticIndex(["apple", "kiwi", "pear"])
+    assert not index.vectorised
+    assert index.contains_many(["kiwi", "plum"]) == [True, False]
+    assert index.rank_many(["a", "lemon", "z"]) == [0, 2, 3]
+
+
+def test_empty():
+    index = StaticIndex([])
+    assert len(index) == 0 and 1 not in index
+    assert index.rank(1) == 0 and index.contains_many([1]) == [False]
+
+
+@pytest.mark.parametrize("cls", [BSTree, AVLTree])
+def test_freeze(cls, values):
+    tree = cls(values=random.sample(values, k=len(values)))
+    index = tree.freeze()
+    assert isinstance(index, StaticIndex)
+    assert list(index.rank_many(values[:10])) == list(range(10))
+    assert all(index.contains_many(values))
@@ -0,0 +1,182 @@
+import random
+
+import pytest
+
+from dspy.bstree import BSTree
+from dspy.treemap import TreeMap
+
+
+@pytest.fixture
+def tmap():
+    return TreeMap({k: str(k) for k in range(0, 100, 10)})
+
+
+def test_init_pairs():
+    m = TreeMap([(3, "c"), (1, "a"), (2, "b")])
+    assert list(m.items()) == [(1, "a"), (2, "b"), (3, "c")]
+    assert len(m) == 3
+
+
+def test_set_get_update(tmap):
+    assert tmap[20] == "20"
+    tmap[20] = "twenty"
+    tmap[25] = "25"
+    assert tmap[20] == "twenty" and tmap[25] == "25"
+    assert len(tmap) == 11
+    assert tmap.get(21) is None and tmap.get(21, -1) == -1
+    with pytest.raises(KeyError):
+        tmap[21]
+
+
+def test_set_mismatch(tmap):
+    with pytest.raises(AttributeError, match="mismatch"):
+        tmap["a"] = 1
+
+
+def test_delitem(tmap):
+    del tmap[40]
+    assert 40 not in tmap and len(tmap) == 9
+    with pytest.raises(KeyError):
+        del tmap[40]
+
+
+def test_delete_keeps_values():
+    # two children deletion moves successor entry
+    keys = random.sample(range(1000), k=300)
+    m = TreeMap((k, -k) for k in keys)
+    for k in keys[:150]:
+        del m[k]
+    assert list(m.items()) == sorted((k, -k) for k in keys[150:])
+
+
+def test_iteration(tmap):
+    assert list(tmap) == list(range(0, 100, 10))
+    assert list(tmap.keys()) == list(tmap)
+    assert list(tmap.values()) == [str(k) for k in range(0, 100, 10)]
+
+
+def test_floor_ceiling(tmap):
+    assert tmap.floor(35) == (30, "30")
+    assert tmap.floor(30) == (30, "30")
+    assert tmap.floor(-1) is None
+    assert tmap.ceiling(35) == (40, "40")
+    assert tmap.ceiling(40) == (40, "40")
+    assert tmap.ceiling(91) is None
+
+
+def test_lower_higher(tmap):
+    assert tmap.lower(30) == (20, "20")
+    assert tmap.lower(31) == (30, "30")
+    assert tmap.lower(0) is None
+    assert tmap.higher(30) == (40, "40")
+    assert tmap.higher(29) == (30, "30")
+    assert tmap.higher(90) is None
+
+
+def test_predecessor_successor(tmap):
+    assert tmap.predecessor(50) == (40, "40")
+    assert tmap.successor(50) == (60, "60")
+    assert tmap.predecessor(0) is None
+    assert tmap.successor(90) is None
+    with pytest.raises(KeyError):
+        tmap.successor(55)
+
+
+def test_neighbours_random():
+    keys = sorted(random.sample(range(10_000), k=500))
+    m = TreeMap((k, None) for k in random.sample(keys, k=len(keys)))
+    for i, k in enumerate(keys):
+        pred = keys[i - 1] if i else None
+        succ = keys[i + 1] if i + 1 < len(keys) else None
+        assert (m.predecessor(k) or (None,))[0] == pred
+        assert (m.successor(k) or (None,))[0] == succ
+        assert (m.lower(k + 1) or (None,))[0] == k
+        assert (m.higher(k - 1) or (None,))[0] == k
+
+
+def test_pop_min_max(tmap):
+    assert tmap.pop_min() == (0, "0")
+    assert tmap.pop_max() == (90, "90")
+    assert len(tmap) == 8
+    assert tmap.min() == 10 and tmap.max() == 80
+
+
+def test_pop_empty():
+    with pytest.raises(KeyError):
+        TreeMap().pop_min()
+    with pytest.raises(KeyError):
+        TreeMap().pop_max()
+
+
+def test_bulk_load_keeps_values():
+    m = TreeMap.bulk_load([(3, "c"), (1, "a"), (3, "C"), ("x", "bad"), (2, "b")])
+    assert list(m.items()) == [(1, "a"), (2, "b"), (3, "C")]
+    assert len(m) == 3 and m.is_bstree()
+    m = TreeMap.bulk_load({k: -k for k in range(100)})
+    assert list(m.values()) == [-k for k in range(100)]
+    assert m.height() == 6
+
+
+def test_keys_only_api_refused(tmp_path):
+    m = TreeMap({1: "a"})
+    with pytest.raises(TypeError, match="map\\[key\\]"):
+        m.insert(2)
+    with pytest.raises(TypeError, match="dumped"):
+        m.dump(tmp_path / "map.bin")
+    with pytest.raises(TypeError, match="keys-only"):
+        TreeMap.load(tmp_path / "map.bin")
+    assert list(m.items()) == [(1, "a")]
+
+
+def test_dtype_trusted():
+    m = TreeMap(dtype=int)
+    with pytest.raises(AttributeError, match="mismatch"):
+        m["a"] = 1
+    m = TreeMap({2: "b"}, dtype=int, trusted=True)
+    m[1] = "a"
+    assert list(m.items()) == [(1, "a"), (2, "b")]
+
+
+@pytest.mark.parametrize("size", [3, 300])  # one by one and rebuild paths
+def test_set_algebra_keeps_values(size):
+    mine = TreeMap((k, f"a{k}") for k in range(0, size, 2))
+    other = TreeMap({1: "b1", 2: "b2", 5: "b5"})
+    want = {k: f"a{k}" for k in range(0, size, 2)}
+    assert dict(mine.union(other).items()) == {**want, **dict(other.items())}
+    assert dict(mine.intersection(other).items()) == {2: "b2"}
+    assert dict(mine.difference(other).items()) == {
+        k: v for k, v in want.items() if k != 2
+    }
+    sym = {k: v for k, v in {**want, 1: "b1", 5: "b5"}.items() if k != 2}
+    assert dict(mine.symmetric_difference(other).items()) == sym
+    m = TreeMap(mine.items())
+    m.update(other)
+    assert dict(m.items()) == {**want, **dict(other.items())}
+    m = TreeMap(mine.items())
+    m.symmetric_difference_update(other)
+    assert dict(m.items()) == sym
+    m = TreeMap(mine.items())
+    m.difference_update(other)
+    assert 2 not in m and m[0] == "a0"
+    m.intersection_update(mine)
+    assert dict(m.items()) == {k: v for k, v in want.items() if k != 2}
+    assert dict(other.items()) == {1: "b1", 2: "b2", 5: "b5"}
+
+
+def test_update_like_dict(tmap):
+    tmap.update({5: "5", 10: "ten"})
+    tmap.update([(15, "15")])
+    tmap.update(TreeMap({20: "twenty"}))
+    assert [tmap[k] for k in (5, 10, 15, 20)] == ["5", "ten", "15", "twenty"]
+    with pytest.raises(AttributeError, match="mismatch"):
+        tmap.update({"a": 1})
+
+
+def test_mixed_algebra_refused(tmap):
+    tree = BSTree(values=[10, 25])
+    for method in ("union", "intersection", "update", "difference_update"):
+        with pytest.raises(TypeError, match="combine"):
+            getattr(tree, method)(tmap)
+        with pytest.raises(TypeError, match="combine"):
+            getattr(tmap, method)(tree)
+    assert tree.inorder() == [10, 25] and len(tmap) == 10